@@ -0,0 +1,297 @@
+import os
+import json
+import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from riot_api import API_KEY, PLATFORM_ROUTING, RateLimiter, RiotAPI, get_queue_type
+from stats_store import MatchStore
+
+TIERS = ["IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "EMERALD", "DIAMOND"]
+APEX_TIERS = ["MASTER", "GRANDMASTER", "CHALLENGER"]
+DIVISIONS = ["I", "II", "III", "IV"]
+QUEUE_IDS = {
+    "RANKED_SOLO_5x5": 420,
+    "RANKED_FLEX_SR": 440,
+}
+CRAWLER_DIR = os.path.join('cache', 'crawler')
+
+
+def crawler_path(platform: str, queue: str, suffix: str) -> str:
+    """Osobne pliki dla każdej platformy i kolejki - strony drabinki różnych platform mają te same numery"""
+    return os.path.join(CRAWLER_DIR, f"{platform}_{queue}_{suffix}")
+
+
+def parse_rate_limits(value: str) -> Tuple[Tuple[int, float], ...]:
+    """Limity w formacie nagłówka X-App-Rate-Limit, np. "20:1,100:120" (zapytania:sekundy)"""
+    limits = []
+    for part in value.split(','):
+        count, period = part.split(':')
+        limits.append((int(count), float(period)))
+    return tuple(limits)
+
+
+class CrawlCheckpoint:
+    """Dziennik postępu crawlera - plik JSONL tylko do dopisywania, więc zapis jest tani nawet przy setkach tysięcy meczy"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pages: Dict[Tuple[str, str, int], bool] = {}
+        self.players: Dict[str, str] = {}
+        self.players_done = set()
+        # Mecz liczy się do dywizji gracza, przez którego trafiliśmy na niego pierwszy raz
+        self.match_tiers: Dict[str, str] = {}
+        self.lock = threading.Lock()
+        self._load()
+
+    def _apply(self, record: Dict):
+        if record['type'] == 'page':
+            self.pages[(record['tier'], record['division'], record['page'])] = record['exhausted']
+            for puuid in record['players']:
+                self.players.setdefault(puuid, record['tier'])
+        elif record['type'] == 'player':
+            self.players_done.add(record['puuid'])
+            tier = self.players.get(record['puuid'], 'UNKNOWN')
+            for match_id in record['matches']:
+                self.match_tiers.setdefault(match_id, tier)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    self._apply(json.loads(line))
+                except Exception:
+                    # Ostatnia linia mogła zostać ucięta przy przerwaniu - pomijamy ją
+                    continue
+
+    def _append(self, record: Dict):
+        with self.lock:
+            self._apply(record)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+
+    def page_done(self, tier: str, division: str, page: int, players: List[str], exhausted: bool):
+        self._append({
+            'type': 'page',
+            'tier': tier,
+            'division': division,
+            'page': page,
+            'players': players,
+            'exhausted': exhausted
+        })
+
+    def player_done(self, puuid: str, match_ids: List[str]):
+        self._append({'type': 'player', 'puuid': puuid, 'matches': match_ids})
+
+    def pending_players(self) -> List[str]:
+        with self.lock:
+            return [puuid for puuid in self.players if puuid not in self.players_done]
+
+
+class LadderCrawler:
+    """Przechodzi po drabince ligowej i zbiera historie meczy graczy do MatchStore"""
+
+    def __init__(self, api: RiotAPI, match_store: MatchStore, checkpoint: CrawlCheckpoint,
+                 platform: str = "euw1", queue: str = "RANKED_SOLO_5x5",
+                 matches_per_player: int = 20, workers: int = 4):
+        self.api = api
+        self.match_store = match_store
+        self.checkpoint = checkpoint
+        self.platform = platform
+        self.region = PLATFORM_ROUTING.get(platform, "europe")
+        self.queue = queue
+        self.matches_per_player = matches_per_player
+        self.workers = workers
+        # Mecze pobierane właśnie przez inny wątek (ID -> Event ustawiany po pobraniu) - ten sam mecz
+        # pojawia się u wielu graczy
+        self.in_flight: Dict[str, threading.Event] = {}
+        self.in_flight_lock = threading.Lock()
+
+    def _resolve_puuid(self, entry: Dict) -> Optional[str]:
+        if entry.get('puuid'):
+            return entry['puuid']
+        summoner_data = self.api.get_summoner_by_id(entry.get('summonerId'), self.platform)
+        return summoner_data.get('puuid') if summoner_data else None
+
+    def crawl_division(self, tier: str, division: str, max_pages: int = 1):
+        """Zapisuje graczy z kolejnych stron dywizji (dla MASTER+ jest jedna lista)"""
+        apex = tier in APEX_TIERS
+        for page in range(1, (1 if apex else max_pages) + 1):
+            key = (tier, division, page)
+            if key in self.checkpoint.pages:
+                if self.checkpoint.pages[key]:
+                    break
+                continue
+
+            if apex:
+                entries = self.api.get_apex_league(self.platform, self.queue, tier)
+            else:
+                entries = self.api.get_league_entries(self.platform, self.queue, tier, division, page)
+            if entries is None:
+                # Nie zapisujemy strony, więc przy wznowieniu zostanie pobrana jeszcze raz
+                print(f"Nie udało się pobrać {tier} {division} strona {page}")
+                break
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                resolved = list(executor.map(self._resolve_puuid, entries))
+            if not all(resolved):
+                # Strona trafia do dziennika dopiero w całości, inaczej nierozwiązani gracze przepadliby na zawsze
+                print(f"{tier} {division} strona {page}: nie udało się ustalić {resolved.count(None)} graczy")
+                break
+
+            self.checkpoint.page_done(tier, division, page, resolved, exhausted=not entries)
+            print(f"{tier} {division} strona {page}: {len(resolved)} graczy")
+            if not entries:
+                break
+
+    def _claim(self, match_id: str) -> Optional[threading.Event]:
+        """None gdy mecz jest nasz, inaczej Event wątku, który już go pobiera"""
+        with self.in_flight_lock:
+            if match_id in self.in_flight:
+                return self.in_flight[match_id]
+            self.in_flight[match_id] = threading.Event()
+            return None
+
+    def _fetch_match(self, match_id: str) -> bool:
+        """Pobiera mecz do magazynu (albo czeka na wątek, który już to robi); True gdy mecz jest w magazynie"""
+        other = self._claim(match_id)
+        if other is not None:
+            other.wait()
+            return self.match_store.has(match_id)
+        try:
+            match = self.api.get_match_details(match_id, self.region)
+            if match:
+                self.match_store.put(match)
+            return bool(match)
+        finally:
+            with self.in_flight_lock:
+                self.in_flight.pop(match_id).set()
+
+    def _crawl_player(self, puuid: str):
+        match_ids = self.api.get_match_history(puuid, self.matches_per_player,
+                                               QUEUE_IDS.get(self.queue), region=self.region)
+        if match_ids is None:
+            return
+
+        failed = 0
+        for match_id in match_ids:
+            if match_id in self.checkpoint.match_tiers or self.match_store.has(match_id):
+                continue
+            if not self._fetch_match(match_id):
+                failed += 1
+
+        # Gracz trafia do dziennika dopiero z kompletem meczy - inaczej wznowienie by go pominęło
+        if failed:
+            print(f"Gracz {puuid}: nie udało się pobrać {failed} meczy, zostaje do ponowienia")
+            return
+        self.checkpoint.player_done(puuid, match_ids)
+
+    def crawl_players(self):
+        """Pobiera historie wszystkich graczy, których jeszcze nie przerobiliśmy"""
+        pending = self.checkpoint.pending_players()
+        print(f"Graczy do pobrania: {len(pending)}")
+
+        def crawl(puuid):
+            try:
+                self._crawl_player(puuid)
+            except Exception as e:
+                print(f"Błąd podczas pobierania meczy gracza {puuid}: {e}")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(crawl, pending))
+
+
+def _aggregate_chunk(args: Tuple[str, List[Tuple[str, str]]]) -> Dict[Tuple[str, str, str], List[int]]:
+    """Liczy gry i wygrane championów w paczce meczy (uruchamiane w osobnym procesie)"""
+    store_dir, items = args
+    match_store = MatchStore(store_dir)
+    tallies = {}
+    for match_id, tier in items:
+        match = match_store.get(match_id)
+        if not match:
+            continue
+        queue = get_queue_type(match['info'].get('queueId', 0))
+        for participant in match['info'].get('participants', []):
+            key = (tier, queue, participant.get('championName', 'Unknown'))
+            if key not in tallies:
+                tallies[key] = [0, 0]
+            tallies[key][0] += 1
+            tallies[key][1] += 1 if participant.get('win') else 0
+    return tallies
+
+
+def aggregate_meta(checkpoint: CrawlCheckpoint, store_dir: str, processes: Optional[int] = None,
+                   chunk_size: int = 2000) -> Dict[str, Dict[str, List[Dict]]]:
+    """Win rate championów per dywizja i kolejka, liczony w puli procesów"""
+    items = sorted(checkpoint.match_tiers.items())
+    chunks = [(store_dir, items[i:i + chunk_size]) for i in range(0, len(items), chunk_size)]
+
+    totals = {}
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for tallies in pool.map(_aggregate_chunk, chunks):
+            for key, (games, wins) in tallies.items():
+                if key not in totals:
+                    totals[key] = [0, 0]
+                totals[key][0] += games
+                totals[key][1] += wins
+
+    meta = {}
+    for (tier, queue, champion), (games, wins) in totals.items():
+        meta.setdefault(tier, {}).setdefault(queue, []).append({
+            'champion': champion,
+            'games': games,
+            'wins': wins,
+            'winrate': round(wins / games * 100, 1) if games else 0
+        })
+    for queues in meta.values():
+        for champions in queues.values():
+            champions.sort(key=lambda x: (x['games'], x['winrate']), reverse=True)
+    return meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawler drabinki ligowej i statystyki championów per dywizja")
+    parser.add_argument("--platform", default="euw1", choices=sorted(PLATFORM_ROUTING))
+    parser.add_argument("--queue", default="RANKED_SOLO_5x5", choices=sorted(QUEUE_IDS))
+    parser.add_argument("--tiers", nargs="+", default=TIERS, choices=TIERS + APEX_TIERS)
+    parser.add_argument("--divisions", nargs="+", default=DIVISIONS, choices=DIVISIONS)
+    parser.add_argument("--pages", type=int, default=1, help="ile stron na dywizję")
+    parser.add_argument("--matches", type=int, default=20, help="ile meczy na gracza")
+    parser.add_argument("--workers", type=int, default=4, help="wątki pobierające")
+    parser.add_argument("--processes", type=int, default=None, help="procesy liczące statystyki")
+    parser.add_argument("--checkpoint", help="domyślnie osobny plik dla platformy i kolejki")
+    parser.add_argument("--output", help="domyślnie osobny plik dla platformy i kolejki")
+    parser.add_argument("--rate-limits", type=parse_rate_limits, default=None,
+                        help="limity klucza jak w nagłówku X-App-Rate-Limit, np. 500:10,30000:600")
+    parser.add_argument("--aggregate-only", action="store_true", help="tylko przelicz statystyki z zebranych meczy")
+    args = parser.parse_args()
+    checkpoint_file = args.checkpoint or crawler_path(args.platform, args.queue, 'checkpoint.jsonl')
+    output = args.output or crawler_path(args.platform, args.queue, 'meta.json')
+
+    match_store = MatchStore()
+    checkpoint = CrawlCheckpoint(checkpoint_file)
+
+    if not args.aggregate_only:
+        # Bez --rate-limits zostają limity klucza deweloperskiego
+        rate_limiter = RateLimiter(args.rate_limits) if args.rate_limits else None
+        api = RiotAPI(API_KEY, match_store, rate_limiter=rate_limiter)
+        crawler = LadderCrawler(api, match_store, checkpoint, args.platform,
+                                args.queue, args.matches, args.workers)
+        for tier in args.tiers:
+            for division in (["I"] if tier in APEX_TIERS else args.divisions):
+                crawler.crawl_division(tier, division, args.pages)
+        crawler.crawl_players()
+
+    meta = aggregate_meta(checkpoint, match_store.directory, args.processes)
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    print(f"Zapisano statystyki z {len(checkpoint.match_tiers)} meczy do {output}")
+
+
+if __name__ == "__main__":
+    main()
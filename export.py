@@ -0,0 +1,261 @@
+import os
+import sys
+import json
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from stats_store import MatchStore
+
+EXPORT_DIR = os.path.join('cache', 'export')
+MANIFEST = 'manifest.json'
+
+# Jeden wiersz = jeden gracz w jednym meczu. Kolumny tekstowe trzymane są jako kody ze słownika.
+COLUMNS = {
+    'match_id': 'int32',
+    'puuid': 'int32',
+    'champion': 'int32',
+    'queue_id': 'int16',
+    'game_start': 'int64',
+    'game_duration': 'int32',
+    'team_id': 'int16',
+    'win': 'int8',
+    'kills': 'int16',
+    'deaths': 'int16',
+    'assists': 'int16',
+    'total_minions': 'int16',
+    'neutral_minions': 'int16',
+    'damage_to_champions': 'int32',
+    'vision_score': 'int16',
+    **{f'item{i}': 'int32' for i in range(7)},
+}
+STRING_COLUMNS = ('match_id', 'puuid', 'champion')
+
+
+def _column_path(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{name}.bin")
+
+
+def _strings_path(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{name}.strings.txt")
+
+
+def _read_manifest(directory: str) -> Dict:
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {
+            'rows': 0,
+            'columns': COLUMNS,
+            'strings': {name: 0 for name in STRING_COLUMNS},
+            'string_bytes': {name: 0 for name in STRING_COLUMNS}
+        }
+
+
+def _read_strings(directory: str, name: str, count: int) -> List[str]:
+    try:
+        with open(_strings_path(directory, name), encoding='utf-8') as f:
+            return [line.rstrip('\n') for _, line in zip(range(count), f)]
+    except FileNotFoundError:
+        return []
+
+
+class ColumnarWriter:
+    """Dopisuje mecze do plików kolumnowych; manifest zapisywany jest na końcu, więc przerwany zapis jest ignorowany"""
+
+    def __init__(self, directory: str = EXPORT_DIR, flush_rows: int = 50000):
+        self.directory = directory
+        self.flush_rows = flush_rows
+        os.makedirs(directory, exist_ok=True)
+
+        self.manifest = _read_manifest(directory)
+        self.rows = self.manifest['rows']
+        self.strings = {}
+        self.codes = {}
+        for name in STRING_COLUMNS:
+            values = _read_strings(directory, name, self.manifest['strings'][name])
+            self.strings[name] = values
+            self.codes[name] = {value: code for code, value in enumerate(values)}
+        self.written_strings = {name: len(values) for name, values in self.strings.items()}
+
+        # Obcinamy to, co zostało po przerwanym zapisie, żeby pliki zgadzały się z manifestem
+        for name, dtype in COLUMNS.items():
+            path = _column_path(directory, name)
+            with open(path, 'ab') as f:
+                f.truncate(self.rows * np.dtype(dtype).itemsize)
+        if 'string_bytes' in self.manifest:
+            self.string_bytes = dict(self.manifest['string_bytes'])
+            for name in STRING_COLUMNS:
+                with open(_strings_path(directory, name), 'ab') as f:
+                    f.truncate(self.string_bytes[name])
+        else:
+            # Manifest sprzed zapisywania długości słowników - jednorazowo przepisujemy je w całości
+            self.string_bytes = {}
+            for name in STRING_COLUMNS:
+                data = self._encode(self.strings[name])
+                with open(_strings_path(directory, name), 'wb') as f:
+                    f.write(data)
+                self.string_bytes[name] = len(data)
+
+        self.buffer: Dict[str, List[int]] = {name: [] for name in COLUMNS}
+
+    @staticmethod
+    def _encode(values: List[str]) -> bytes:
+        return "".join(f"{value}\n" for value in values).encode('utf-8')
+
+    def _code(self, column: str, value: str) -> int:
+        codes = self.codes[column]
+        if value not in codes:
+            codes[value] = len(self.strings[column])
+            self.strings[column].append(value)
+        return codes[value]
+
+    def has_match(self, match_id: str) -> bool:
+        return match_id in self.codes['match_id']
+
+    def add_match(self, match: Dict) -> bool:
+        """Dodaje wiersze wszystkich graczy meczu, zwraca False gdy mecz już jest w eksporcie"""
+        match_id = match.get('metadata', {}).get('matchId')
+        if not match_id or self.has_match(match_id):
+            return False
+
+        info = match['info']
+        match_code = self._code('match_id', match_id)
+        for participant in info.get('participants', []):
+            row = {
+                'match_id': match_code,
+                'puuid': self._code('puuid', participant.get('puuid', '')),
+                'champion': self._code('champion', participant.get('championName', 'Unknown')),
+                'queue_id': info.get('queueId', 0),
+                'game_start': info.get('gameStartTimestamp', info.get('gameCreation', 0)),
+                'game_duration': info.get('gameDuration', 0),
+                'team_id': participant.get('teamId', 0),
+                'win': 1 if participant.get('win') else 0,
+                'kills': participant.get('kills', 0),
+                'deaths': participant.get('deaths', 0),
+                'assists': participant.get('assists', 0),
+                'total_minions': participant.get('totalMinionsKilled', 0),
+                'neutral_minions': participant.get('neutralMinionsKilled', 0),
+                'damage_to_champions': participant.get('totalDamageDealtToChampions', 0),
+                'vision_score': participant.get('visionScore', 0),
+                **{f'item{i}': participant.get(f'item{i}', 0) for i in range(7)},
+            }
+            for name, value in row.items():
+                self.buffer[name].append(value)
+
+        if len(self.buffer['match_id']) >= self.flush_rows:
+            self.flush()
+        return True
+
+    def flush(self):
+        pending = len(self.buffer['match_id'])
+        if pending:
+            for name, dtype in COLUMNS.items():
+                with open(_column_path(self.directory, name), 'ab') as f:
+                    f.write(np.asarray(self.buffer[name], dtype=dtype).tobytes())
+                self.buffer[name] = []
+
+        for name in STRING_COLUMNS:
+            new_values = self.strings[name][self.written_strings[name]:]
+            if new_values:
+                data = self._encode(new_values)
+                with open(_strings_path(self.directory, name), 'ab') as f:
+                    f.write(data)
+                self.written_strings[name] = len(self.strings[name])
+                self.string_bytes[name] += len(data)
+
+        self.rows += pending
+        self.manifest = {
+            'rows': self.rows,
+            'columns': COLUMNS,
+            'strings': dict(self.written_strings),
+            'string_bytes': dict(self.string_bytes)
+        }
+        tmp_path = os.path.join(self.directory, f"{MANIFEST}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, os.path.join(self.directory, MANIFEST))
+
+
+class ColumnarReader:
+    """Odczyt eksportu przez np.memmap - kolumny nie są kopiowane do pamięci"""
+
+    def __init__(self, directory: str = EXPORT_DIR):
+        self.directory = directory
+        self.manifest = _read_manifest(directory)
+        self.rows = self.manifest['rows']
+        self._strings: Dict[str, List[str]] = {}
+        self._codes: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        dtype = self.manifest['columns'][name]
+        if self.rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(_column_path(self.directory, name), dtype=dtype, mode='r', shape=(self.rows,))
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.column(name)
+
+    def strings(self, name: str) -> List[str]:
+        """Słownik kolumny tekstowej - kod to indeks na liście"""
+        if name not in self._strings:
+            self._strings[name] = _read_strings(self.directory, name, self.manifest['strings'][name])
+        return self._strings[name]
+
+    def code(self, name: str, value: str) -> Optional[int]:
+        if name not in self._codes:
+            self._codes[name] = {string: code for code, string in enumerate(self.strings(name))}
+        return self._codes[name].get(value)
+
+    def player_rows(self, puuid: str) -> np.ndarray:
+        """Indeksy wierszy jednego gracza"""
+        code = self.code('puuid', puuid)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.column('puuid') == code)
+
+    def champion_winrates(self, queue_id: Optional[int] = None) -> List[Dict]:
+        """Gry i win rate championów policzone jednym przejściem po kolumnach"""
+        champions = self.column('champion')
+        wins = self.column('win')
+        if queue_id is not None:
+            mask = self.column('queue_id') == queue_id
+            champions, wins = champions[mask], wins[mask]
+
+        names = self.strings('champion')
+        games = np.bincount(champions, minlength=len(names))
+        won = np.bincount(champions, weights=wins, minlength=len(names))
+        return sorted(
+            (
+                {'champion': names[code], 'games': int(games[code]), 'winrate': round(float(won[code] / games[code]) * 100, 1)}
+                for code in np.flatnonzero(games)
+            ),
+            key=lambda x: x['games'],
+            reverse=True
+        )
+
+
+def export_matches(match_store: MatchStore, directory: str = EXPORT_DIR,
+                   match_ids: Optional[Iterable[str]] = None) -> int:
+    """Dopisuje do eksportu mecze z magazynu, których jeszcze tam nie ma; zwraca liczbę nowych meczy"""
+    writer = ColumnarWriter(directory)
+    added = 0
+    for match_id in match_ids if match_ids is not None else match_store.iter_ids():
+        if writer.has_match(match_id):
+            continue
+        match = match_store.get(match_id)
+        if match and writer.add_match(match):
+            added += 1
+    writer.flush()
+    return added
+
+
+if __name__ == "__main__":
+    # Użycie: python export.py [katalog_docelowy]
+    target = sys.argv[1] if len(sys.argv) > 1 else EXPORT_DIR
+    added = export_matches(MatchStore(), target)
+    print(f"Dodano {added} meczy, w eksporcie jest {len(ColumnarReader(target))} wierszy")
@@ -0,0 +1,226 @@
+import os
+import json
+import time
+import heapq
+import random
+import threading
+from typing import Callable, Dict, List, Optional
+
+from riot_api import PLATFORM_ROUTING, RiotAPI
+
+# Odstępy sprawdzania w sekundach
+IN_GAME_INTERVAL = 60        # gracz w grze - czekamy aż skończy
+ACTIVE_INTERVAL = 120        # grał niedawno, pewnie zaraz wejdzie do kolejnej gry
+IDLE_MIN_INTERVAL = 300      # nieaktywny - odstęp rośnie x2 aż do maksimum
+IDLE_MAX_INTERVAL = 1800
+ERROR_INTERVAL = 60
+# Jak długo po ostatniej grze gracz uchodzi za aktywnego
+ACTIVE_WINDOW = 3600
+# Co ile sprawdzamy nowe mecze, gdy gracz nie jest w grze
+MATCH_IDS_INTERVAL = 900
+
+
+class LiveGameWatcher:
+    """Śledzi w tle, kiedy gracze wchodzą do gry i z niej wychodzą"""
+
+    def __init__(self, api: RiotAPI, on_event: Callable[[Dict], None], reserve: float = 0.5,
+                 tracked_path: str = os.path.join('cache', 'tracked.json')):
+        self.api = api
+        # Wywoływane w wątkach watchera - odbiorca sam przekazuje zdarzenia do wątku Tk
+        self.on_event = on_event
+        self.reserve = reserve
+        self.tracked_path = tracked_path
+        self.players: Dict[str, Dict] = {}
+        # Osobny harmonogram i wątek dla każdej platformy, żeby wolny region nie wstrzymywał pozostałych;
+        # gracze z nieznaną platformą czekają pod kluczem ''
+        self.schedules: Dict[str, List] = {}
+        self.wakeups: Dict[str, threading.Event] = {}
+        self.loops: Dict[str, threading.Thread] = {}
+        self.lock = threading.Lock()
+        self.started = False
+        self.stopped = threading.Event()
+
+    def track(self, puuid: str, platform: Optional[str] = None, name: Optional[str] = None):
+        """Dodaje gracza do śledzenia - pierwsze sprawdzenie od razu"""
+        with self.lock:
+            if puuid in self.players:
+                return
+            self.players[puuid] = {
+                'puuid': puuid,
+                'name': name or puuid[:8],
+                'platform': platform,
+                'in_game': False,
+                'game_id': None,
+                'last_match_id': None,
+                'ids_checked': 0.0,
+                'last_active': 0.0,
+                'idle_interval': IDLE_MIN_INTERVAL,
+                'next_poll': time.time()
+            }
+            self._push(self.players[puuid])
+
+    def untrack(self, puuid: str):
+        with self.lock:
+            self.players.pop(puuid, None)
+
+    def is_tracked(self, puuid: str) -> bool:
+        with self.lock:
+            return puuid in self.players
+
+    def start(self):
+        with self.lock:
+            self.started = True
+            for platform in self.schedules:
+                self._start_loop(platform)
+
+    def stop(self):
+        self.stopped.set()
+        with self.lock:
+            for wakeup in self.wakeups.values():
+                wakeup.set()
+
+    def _push(self, player: Dict):
+        """Wstawia gracza do harmonogramu jego platformy (wywoływane pod self.lock)"""
+        platform = player['platform'] or ''
+        if platform not in self.schedules:
+            self.schedules[platform] = []
+            self.wakeups[platform] = threading.Event()
+            if self.started:
+                self._start_loop(platform)
+        heapq.heappush(self.schedules[platform], (player['next_poll'], player['puuid']))
+        self.wakeups[platform].set()
+
+    def _start_loop(self, platform: str):
+        if platform in self.loops:
+            return
+        # Wątki demony - zablokowany na limicie zapytań wątek nie wstrzymuje zamknięcia aplikacji
+        loop = threading.Thread(target=self._run_platform, args=(platform,), daemon=True,
+                                name=f"live-watcher-{platform or 'unknown'}")
+        self.loops[platform] = loop
+        loop.start()
+
+    def load_tracked(self):
+        """Wczytuje listę śledzonych graczy zapisaną przy poprzednim uruchomieniu"""
+        try:
+            with open(self.tracked_path, encoding='utf-8') as f:
+                for player in json.load(f):
+                    self.track(player['puuid'], player.get('platform'), player.get('name'))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Błąd podczas wczytywania śledzonych graczy: {e}")
+
+    def save_tracked(self):
+        with self.lock:
+            tracked = [
+                {'puuid': p['puuid'], 'platform': p['platform'], 'name': p['name']}
+                for p in self.players.values()
+            ]
+        try:
+            os.makedirs(os.path.dirname(self.tracked_path), exist_ok=True)
+            with open(self.tracked_path, 'w', encoding='utf-8') as f:
+                json.dump(tracked, f)
+        except Exception as e:
+            print(f"Błąd podczas zapisu śledzonych graczy: {e}")
+
+    def _due_players(self, platform: str) -> List[Dict]:
+        """Zdejmuje z harmonogramu platformy graczy, których czas sprawdzenia minął"""
+        now = time.time()
+        due = []
+        with self.lock:
+            schedule = self.schedules[platform]
+            while schedule and schedule[0][0] <= now:
+                next_poll, puuid = heapq.heappop(schedule)
+                player = self.players.get(puuid)
+                # Stare wpisy po untrack albo zmianie terminu po prostu pomijamy
+                if player and player['next_poll'] == next_poll:
+                    due.append(player)
+        return due
+
+    def _reschedule(self, player: Dict, interval: float):
+        # Losowe przesunięcie, żeby tysiące graczy nie wypadały w tej samej sekundzie
+        player['next_poll'] = time.time() + interval * random.uniform(0.9, 1.1)
+        with self.lock:
+            if player['puuid'] in self.players:
+                # Po ustaleniu platformy gracz przechodzi do harmonogramu swojej platformy
+                self._push(player)
+
+    def _emit(self, event_type: str, player: Dict, **details):
+        self.on_event({
+            'type': event_type,
+            'puuid': player['puuid'],
+            'name': player['name'],
+            'time': time.time(),
+            **details
+        })
+
+    def _check_match_ids(self, player: Dict):
+        region = PLATFORM_ROUTING.get(player['platform'], "europe")
+        match_ids = self.api.get_match_history(player['puuid'], 1, region=region)
+        player['ids_checked'] = time.time()
+        if not match_ids:
+            return
+        if player['last_match_id'] and match_ids[0] != player['last_match_id']:
+            player['last_active'] = time.time()
+            self._emit('new_match', player, match_id=match_ids[0])
+        player['last_match_id'] = match_ids[0]
+
+    def _poll(self, player: Dict) -> float:
+        """Sprawdza jednego gracza i zwraca odstęp do następnego sprawdzenia"""
+        if not player['platform']:
+            summoner_data = self.api.get_summoner_by_puuid(player['puuid'])
+            if not summoner_data:
+                return ERROR_INTERVAL
+            player['platform'] = summoner_data['platform']
+
+        in_game, game = self.api.get_active_game(player['puuid'], player['platform'])
+        if in_game is None:
+            return ERROR_INTERVAL
+
+        now = time.time()
+        if in_game:
+            player['last_active'] = now
+            player['idle_interval'] = IDLE_MIN_INTERVAL
+            if not player['in_game'] or player['game_id'] != game.get('gameId'):
+                player['in_game'] = True
+                player['game_id'] = game.get('gameId')
+                self._emit('game_start', player, game_id=game.get('gameId'),
+                           queue_id=game.get('gameQueueConfigId'), game_mode=game.get('gameMode'))
+            return IN_GAME_INTERVAL
+
+        game_ended = player['in_game']
+        if game_ended:
+            player['in_game'] = False
+            self._emit('game_end', player, game_id=player['game_id'])
+
+        if game_ended or now - player['ids_checked'] >= MATCH_IDS_INTERVAL:
+            self._check_match_ids(player)
+
+        if now - player['last_active'] < ACTIVE_WINDOW:
+            return ACTIVE_INTERVAL
+
+        interval = player['idle_interval']
+        player['idle_interval'] = min(IDLE_MAX_INTERVAL, interval * 2)
+        return interval
+
+    def _run_platform(self, platform: str):
+        # Limity Riot są per region, więc każda platforma czeka tylko na własne zapytania
+        wakeup = self.wakeups[platform]
+        with self.api.low_priority(self.reserve):
+            while not self.stopped.is_set():
+                wakeup.clear()
+                for player in self._due_players(platform):
+                    if self.stopped.is_set():
+                        return
+                    try:
+                        interval = self._poll(player)
+                    except Exception as e:
+                        print(f"Błąd podczas sprawdzania gracza {player['name']}: {e}")
+                        interval = ERROR_INTERVAL
+                    self._reschedule(player, interval)
+
+                with self.lock:
+                    schedule = self.schedules[platform]
+                    next_poll = schedule[0][0] if schedule else None
+                timeout = max(0.0, next_poll - time.time()) if next_poll else None
+                wakeup.wait(timeout)
@@ -7,266 +7,20 @@ import requests
 from io import BytesIO
 import datetime
 import os
-from typing import Dict, List, Optional
-
-# Jedna klasa w programie do obsługi API
-class RiotAPI:
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-        self.headers = {
-            "X-Riot-Token": self.api_key
-        }
-
-    def get_account_by_riot_id(self, game_name: str, tag_line: str) -> Optional[Dict]:
-        """Pobiera dane konta na podstawie Riot ID"""
-        regions = ["europe", "americas", "asia", "sea"]
-        
-        for region in regions:
-            url = f"https://{region}.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
-            try:
-                response = requests.get(url, headers=self.headers)
-                if response.status_code == 200:
-                    return response.json()
-            except Exception as e:
-                print(f"Błąd podczas pobierania danych konta: {e}")
-                continue
-        return None
-
-    def get_summoner_by_puuid(self, puuid: str) -> Optional[Dict]:
-        """Pobiera dane przywoływacza po PUUID"""
-        regions = ["eun1", "euw1", "na1", "kr", "br1", "jp1", "la1", "la2", "oc1", "tr1", "ru"]
-        
-        for region in regions:
-            url = f"https://{region}.api.riotgames.com/lol/summoner/v4/summoners/by-puuid/{puuid}"
-            response = requests.get(url, headers=self.headers)
-            if response.status_code == 200:
-                return response.json()
-        return None
-
-    def get_ranked_stats(self, summoner_id: str) -> Optional[List[Dict]]:
-        """Pobiera statystyki rankingowe"""
-        url = f"https://eun1.api.riotgames.com/lol/league/v4/entries/by-summoner/{summoner_id}"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code == 200:
-            return response.json()
-        return None
-
-    def get_match_history(self, puuid: str, count: int = 20) -> Optional[List[str]]:
-        """Pobiera historię meczy"""
-        url = f"https://europe.api.riotgames.com/lol/match/v5/matches/by-puuid/{puuid}/ids?count={count}"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code == 200:
-            return response.json()
-        return None
-
-    def get_match_details(self, match_id: str) -> Optional[Dict]:
-        """Pobiera szczegóły meczu"""
-        url = f"https://europe.api.riotgames.com/lol/match/v5/matches/{match_id}"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code == 200:
-            return response.json()
-        return None
-
-    def get_champion_mastery(self, puuid: str) -> Optional[List[Dict]]:
-        """Pobiera top championów gracza"""
-        url = f"https://eun1.api.riotgames.com/lol/champion-mastery/v4/champion-masteries/by-puuid/{puuid}"
-        response = requests.get(url, headers=self.headers)
-        if response.status_code == 200:
-            return response.json()
-        return None
-
-    def get_player_data(self, riot_id: str) -> Dict:
-        """Pobiera wszystkie dane gracza"""
-        try:
-            if '#' in riot_id:
-                game_name, tag_line = riot_id.split('#')
-            else:
-                game_name = riot_id
-                tag_line = 'EUW'
-
-            # Pobierz dane konta
-            account_data = self.get_account_by_riot_id(game_name, tag_line)
-            if not account_data:
-                return None
-
-            puuid = account_data.get('puuid')
-            if not puuid:
-                return None
-
-            # Pobierz pozostałe dane
-            summoner_data = self.get_summoner_by_puuid(puuid)
-            matches_data = self.get_match_history_details(puuid)
-            ranked_stats = self.get_ranked_stats(summoner_data.get('id')) if summoner_data else None
-            champion_mastery = self.get_champion_mastery(puuid)
-
-            # Przetwórz dane
-            if summoner_data:
-                summoner_data['gameName'] = account_data.get('gameName')
-                summoner_data['tagLine'] = account_data.get('tagLine')
-
-            processed_data = self.process_summoner_data(summoner_data, matches_data)
-
-            return {
-                "account_data": account_data,
-                "summoner_data": processed_data,
-                "ranked_stats": ranked_stats or [],
-                "matches_data": matches_data,
-                "champion_mastery": champion_mastery or []
-            }
-
-        except Exception as e:
-            print(f"Błąd podczas pobierania danych gracza: {e}")
-            return None
-
-    def get_match_history_details(self, puuid: str) -> List[Dict]:
-        """Pobiera szczegółowe dane meczy"""
-        matches_data = []
-        match_ids = self.get_match_history(puuid, 20)
-        
-        if match_ids:
-            for match_id in match_ids:
-                match_details = self.get_match_details(match_id)
-                if match_details:
-                    matches_data.append(match_details)
-        
-        return matches_data
-
-    def process_summoner_data(self, summoner_data: Dict, matches_data: List[Dict]) -> Dict:
-        """Przetwarza dane przywoływacza"""
-        if not summoner_data:
-            return None
-
-        avg_stats = self.calculate_average_stats(matches_data, summoner_data.get('puuid', ''))
-        top_champions = self.calculate_champion_stats(matches_data, summoner_data.get('puuid', ''))
-
-        return {
-            'name': summoner_data.get('gameName', summoner_data.get('name', 'Unknown')),
-            'level': summoner_data.get('summonerLevel', 0),
-            'icon_id': summoner_data.get('profileIconId', 1),
-            'avg_stats': avg_stats,
-            'top_champions': top_champions,
-            'puuid': summoner_data.get('puuid', '')
-        }
-
-    def calculate_average_stats(self, matches_data: List[Dict], puuid: str) -> Dict:
-        """Oblicza średnie statystyki z meczy"""
-        if not matches_data:
-            return {
-                'kda': '0/0/0',
-                'cs_per_min': 0,
-                'damage_per_min': 0,
-                'vision_score': 0,
-                'total_games': 0,
-                'wins': 0
-            }
-
-        total_kills = total_deaths = total_assists = 0
-        total_cs = total_damage = total_vision_score = total_game_duration = 0
-        wins = valid_games = 0
-
-        for match in matches_data:
-            try:
-                player_data = next((p for p in match['info']['participants'] 
-                                  if p['puuid'] == puuid), None)
-                if not player_data:
-                    continue
-
-                game_duration = match['info']['gameDuration'] / 60
-                
-                total_kills += player_data['kills']
-                total_deaths += player_data['deaths']
-                total_assists += player_data['assists']
-                total_cs += player_data['totalMinionsKilled'] + player_data['neutralMinionsKilled']
-                total_damage += player_data['totalDamageDealtToChampions']
-                total_vision_score += player_data['visionScore']
-                total_game_duration += game_duration
-
-                if player_data['win']:
-                    wins += 1
-
-                valid_games += 1
-
-            except Exception as e:
-                print(f"Błąd podczas przetwarzania meczu: {e}")
-                continue
-
-        if valid_games == 0:
-            return {
-                'kda': '0/0/0',
-                'cs_per_min': 0,
-                'damage_per_min': 0,
-                'vision_score': 0,
-                'total_games': 0,
-                'wins': 0
-            }
-
-        avg_deaths = total_deaths / valid_games
-        kda = f"{total_kills/valid_games:.1f}/{avg_deaths:.1f}/{total_assists/valid_games:.1f}"
-        
-        return {
-            'kda': kda,
-            'cs_per_min': round(total_cs / total_game_duration, 1),
-            'damage_per_min': round(total_damage / total_game_duration, 1),
-            'vision_score': round(total_vision_score / valid_games, 1),
-            'total_games': valid_games,
-            'wins': wins,
-            'winrate': round((wins / valid_games * 100), 1) if valid_games > 0 else 0
-        }
-
-    def calculate_champion_stats(self, matches_data: List[Dict], puuid: str) -> List[Dict]:
-        """Oblicza statystyki championów"""
-        champion_stats = {}
-        
-        for match in matches_data:
-            try:
-                player_data = next((p for p in match['info']['participants'] 
-                                  if p['puuid'] == puuid), None)
-                if not player_data:
-                    continue
-                
-                champion_name = player_data['championName']
-                if champion_name not in champion_stats:
-                    champion_stats[champion_name] = {
-                        'games': 0,
-                        'wins': 0,
-                        'kills': 0,
-                        'deaths': 0,
-                        'assists': 0
-                    }
-                
-                stats = champion_stats[champion_name]
-                stats['games'] += 1
-                if player_data['win']:
-                    stats['wins'] += 1
-                stats['kills'] += player_data['kills']
-                stats['deaths'] += player_data['deaths']
-                stats['assists'] += player_data['assists']
-                
-            except Exception as e:
-                print(f"Błąd podczas obliczania statystyk championa: {e}")
-                continue
-        
-        champions_list = []
-        for champ, stats in champion_stats.items():
-            winrate = (stats['wins'] / stats['games']) * 100 if stats['games'] > 0 else 0
-            avg_kda = ((stats['kills'] + stats['assists']) / stats['deaths']) if stats['deaths'] > 0 else (stats['kills'] + stats['assists'])
-            
-            champions_list.append({
-                'name': champ,
-                'games': stats['games'],
-                'winrate': winrate,
-                'avg_kda': avg_kda,
-                'kills': stats['kills'],
-                'deaths': stats['deaths'],
-                'assists': stats['assists']
-            })
-        
-        champions_list.sort(key=lambda x: (x['games'], x['winrate']), reverse=True)
-        return champions_list[:5]
+from collections import deque
+from riot_api import API_KEY, ALL_QUEUES, RiotAPI, get_queue_type
+from stats_store import AggregateStore, MatchStore
+from live_watcher import LiveGameWatcher
+import profiling
+from profiling import profile_section, start_search_profile, timed
+from prefetch import Prefetcher
+from ui_dispatcher import UIDispatcher
 
 # Fukncje przeniesione w jedno miejsce dla czytelności kodu
 
 def zamknij_okno():
+    live_watcher.stop()
+    live_watcher.save_tracked()
     root.destroy()
 
 def saveLastClick(event):
@@ -284,16 +38,35 @@ def calculate_winrate(ranked_data):
         return 0
     return round((ranked_data['wins'] / total_games) * 100, 1)
 
+def load_resized_image(filepath, size):
+    # PhotoImage musi powstać w wątku Tk, ale wczytanie i skalowanie PIL można zrobić wcześniej w tle
+    key = (filepath, size)
+    if key not in resized_image_cache:
+        img = Image.open(filepath)
+        resized_image_cache[key] = img.resize(size, Image.Resampling.LANCZOS)
+    return resized_image_cache[key]
+
+def prefetch_icon(kind, name):
+    if kind == 'champion':
+        filepath = f"assets/champions/{name}.png"
+        if (filepath, (40, 40)) not in resized_image_cache and os.path.exists(filepath):
+            load_resized_image(filepath, (40, 40))
+    else:
+        filepath = f"assets/items/{name}.png"
+        if name not in getattr(load_item_icon, 'cache', {}) and os.path.exists(filepath):
+            load_resized_image(filepath, (30, 30))
+
+@timed("load_champion_icon")
 def load_champion_icon(champion_id):
     try:
         filepath = f"assets/champions/{champion_id}.png"
-        img = Image.open(filepath)
-        img = img.resize((40, 40), Image.Resampling.LANCZOS)
+        img = load_resized_image(filepath, (40, 40))
         return ImageTk.PhotoImage(img)
     except Exception as e:
         print(f"Błąd ładowania ikony championa: {e}")
         return None
 
+@timed("load_rank_icon")
 def load_rank_icon(tier):
     try:
         filepath = f"assets/ranks/{tier.lower()}.png"
@@ -304,6 +77,7 @@ def load_rank_icon(tier):
         print(f"Błąd ładowania ikony rangi: {e}")
         return None
 
+@timed("load_item_icon")
 def load_item_icon(item_id):
     """Ładuje ikonę przedmiotu z API Riot Games"""
     try:
@@ -315,8 +89,7 @@ def load_item_icon(item_id):
             return load_item_icon.cache[item_id]
 
         filepath = f"assets/items/{item_id}.png"
-        img = Image.open(filepath)
-        img = img.resize((30, 30), Image.Resampling.LANCZOS)
+        img = load_resized_image(filepath, (30, 30))
         photo = ImageTk.PhotoImage(img)
 
         load_item_icon.cache[item_id] = photo
@@ -325,6 +98,7 @@ def load_item_icon(item_id):
         print(f"Błąd podczas ładowania ikony przedmiotu {item_id}: {e}")
         return None
 
+@timed("load_profile_icon")
 def load_profile_icon(icon_id):
     try:
         url = f"http://ddragon.leagueoflegends.com/cdn/13.24.1/img/profileicon/{icon_id}.png"
@@ -337,6 +111,7 @@ def load_profile_icon(icon_id):
         print(f"Błąd ładowania ikony profilu: {e}")
         return None
 
+@timed("load_summoner_spell_icon")
 def load_summoner_spell_icon(spell_id):
     """Ładuje ikonę czaru przywoływacza"""
     spell_path = os.path.join('assets', 'summoner_spells', f"{spell_id}.png")
@@ -349,25 +124,7 @@ def load_summoner_spell_icon(spell_id):
             print(f"Błąd podczas ładowania ikony czaru {spell_id}: {e}")
     return None
 
-def get_queue_type(queue_id):
-    queue_types = {
-        400: "Normal",
-        420: "Ranked Solo",
-        430: "Normal",
-        440: "Ranked Flex",
-        450: "ARAM",
-        700: "Clash",
-        830: "Co-op vs AI",
-        840: "Co-op vs AI",
-        850: "Co-op vs AI",
-        900: "URF",
-        1020: "One for All",
-        1300: "Nexus Blitz",
-        1400: "Ultimate Spellbook",
-        1700: "Arena",
-    }
-    return queue_types.get(queue_id, "Other")
-
+@timed("update_match_history")
 def update_match_history(matches_data, puuid):
     try:
         for widget in match_history_panel.winfo_children():
@@ -474,52 +231,119 @@ def update_champion_stats(champion_data):
                             key=lambda x: (x['games'], x['winrate']), 
                             reverse=True)[:5]
     
-    for i, (champ_frame, champ_data) in enumerate(zip(top_champs_container.winfo_children(), sorted_champions)):
+    for i, champ_frame in enumerate(top_champs_container.winfo_children()):
         champ_icon_frame = champ_frame.winfo_children()[0]
         champ_icon_label = champ_icon_frame.winfo_children()[0]
         champ_info_frame = champ_frame.winfo_children()[1]
         champ_name_label = champ_info_frame.winfo_children()[0]
         champ_stats_label = champ_info_frame.winfo_children()[1]
 
+        # Po zmianie filtra championów może być mniej niż 5, więc czyścimy resztę
+        if i >= len(sorted_champions):
+            ui.configure(champ_icon_label, image='')
+            ui.configure(champ_name_label, text="")
+            ui.configure(champ_stats_label, text="")
+            continue
+
+        champ_data = sorted_champions[i]
         champion_icon = load_champion_icon(champ_data['name'])
         if champion_icon:
-            champ_icon_label.configure(image=champion_icon)
-            champ_icon_label.image = champion_icon
+            ui.configure(champ_icon_label, image=champion_icon)
 
-        champ_name_label.configure(text=champ_data['name'])
+        ui.configure(champ_name_label, text=champ_data['name'])
         stats_text = f"{champ_data['games']} gier | {champ_data['winrate']:.1f}% WR | KDA: {champ_data['avg_kda']:.1f}"
-        champ_stats_label.configure(text=stats_text)
+        ui.configure(champ_stats_label, text=stats_text)
+
+def update_avg_stats(avg_stats):
+    # Tuteż trochę spędziłem
+    ui.configure(kda_value, text=avg_stats.get('kda', '0/0/0'))
+    ui.configure(cs_value, text=f"{avg_stats.get('cs_per_min', 0):.1f}")
+    dpm = avg_stats.get('damage_per_min', 0)
+    dpm_text = f"{dpm/1000:.1f}k" if dpm >= 1000 else f"{dpm:.0f}"
+    ui.configure(dpm_value, text=dpm_text)
+    ui.configure(ward_value, text=f"{avg_stats.get('vision_score', 0):.1f}")
+
+    total_games = avg_stats.get('total_games', 0)
+    wins = avg_stats.get('wins', 0)
+    winrate = (wins / total_games * 100) if total_games > 0 else 0
+    games_info = f"W/L: {wins}/{total_games-wins} ({winrate:.1f}%)"
+    ui.configure(games_label, text=games_info)
+
+def update_queue_selectors(queue_stats):
+    global current_queue_stats
+    current_queue_stats = queue_stats
+    queues = list(queue_stats) or [ALL_QUEUES]
+    for selector, variable in ((stats_queue_select, stats_queue_var), (champs_queue_select, champs_queue_var)):
+        ui.configure(selector, values=queues)
+        variable.set(ALL_QUEUES)
+
+def on_stats_queue_change(event=None):
+    # Statystyki są policzone wcześniej, więc tu jest tylko odczyt ze słownika
+    queue_data = current_queue_stats.get(stats_queue_var.get())
+    if queue_data:
+        update_avg_stats(queue_data['avg_stats'])
+
+def on_champs_queue_change(event=None):
+    queue_data = current_queue_stats.get(champs_queue_var.get())
+    if queue_data:
+        update_champion_stats(queue_data['top_champions'])
+
+def track_current_player():
+    if not current_player:
+        show_error_message("Najpierw wyszukaj gracza")
+        return
+    if live_watcher.is_tracked(current_player['puuid']):
+        live_watcher.untrack(current_player['puuid'])
+        add_live_event(f"Koniec śledzenia: {current_player.get('name')}")
+    else:
+        live_watcher.track(current_player['puuid'], current_player.get('platform'), current_player.get('name'))
+        add_live_event(f"Śledzenie: {current_player.get('name')}")
+    update_track_button()
+
+def update_track_button():
+    tracked = bool(current_player) and live_watcher.is_tracked(current_player['puuid'])
+    ui.configure(track_button, text="Nie śledź" if tracked else "Śledź")
+
+def add_live_event(text):
+    live_events.append(f"{datetime.datetime.now():%H:%M} {text}")
+    # Kilka zdarzeń naraz to i tak jedna zmiana etykiety przy najbliższym ticku
+    ui.configure(live_events_label, text="\n".join(live_events))
+
+def format_live_event(event):
+    if event['type'] == 'game_start':
+        return f"{event['name']}: w grze ({event.get('game_mode') or get_queue_type(event.get('queue_id'))})"
+    if event['type'] == 'game_end':
+        return f"{event['name']}: koniec gry"
+    return f"{event['name']}: nowy mecz {event.get('match_id')}"
+
+def on_live_event(event):
+    # Wywoływane w wątkach watchera - zdarzenia czekają w skrzynce, a panel odświeża się raz na tick
+    live_inbox.append(event)
+    ui.call(show_live_events, key='live')
+
+def show_live_events():
+    while live_inbox:
+        add_live_event(format_live_event(live_inbox.popleft()))
 
 def update_ui(player_data):
+    global current_player
     try:
         summoner_data = player_data.get('summoner_data', {})
         if not summoner_data:
             show_error_message("Nie znaleziono danych gracza")
             return
+        current_player = summoner_data
+        update_track_button()
 
         profile_icon_id = summoner_data.get('profileIconId', 1)
         profile_icon = load_profile_icon(profile_icon_id)
         if profile_icon:
-            avatar_label.configure(image=profile_icon)
-            avatar_label.image = profile_icon
-        nickname_label.configure(text=summoner_data.get('name', 'Nieznany'))
-        level_label.configure(text=f"Poziom: {summoner_data.get('level', 0)}")
+            ui.configure(avatar_label, image=profile_icon)
+        ui.configure(nickname_label, text=summoner_data.get('name', 'Nieznany'))
+        ui.configure(level_label, text=f"Poziom: {summoner_data.get('level', 0)}")
 
-        avg_stats = summoner_data.get('avg_stats', {})
-        
-        # Tuteż trochę spędziłem
-        kda_value.config(text=avg_stats.get('kda', '0/0/0'))
-        cs_value.config(text=f"{avg_stats.get('cs_per_min', 0):.1f}")
-        dpm = avg_stats.get('damage_per_min', 0)
-        dpm_text = f"{dpm/1000:.1f}k" if dpm >= 1000 else f"{dpm:.0f}"
-        dpm_value.config(text=dpm_text)
-        ward_value.config(text=f"{avg_stats.get('vision_score', 0):.1f}")
-
-        total_games = avg_stats.get('total_games', 0)
-        wins = avg_stats.get('wins', 0)
-        winrate = (wins / total_games * 100) if total_games > 0 else 0
-        games_info = f"W/L: {wins}/{total_games-wins} ({winrate:.1f}%)"
-        games_label.config(text=games_info)
+        update_queue_selectors(summoner_data.get('queue_stats', {}))
+        update_avg_stats(summoner_data.get('avg_stats', {}))
 
         matches_data = player_data.get('matches_data', [])
         update_match_history(matches_data, summoner_data.get('puuid'))
@@ -542,18 +366,17 @@ def update_ui(player_data):
 
                 rank_icon = load_rank_icon(tier)
                 if rank_icon:
-                    rank_icon_label.configure(image=rank_icon)
-                    rank_icon_label.image = rank_icon
+                    ui.configure(rank_icon_label, image=rank_icon)
 
-                rank_name.config(text=f"{tier} {rank}")
-                winrate_label.config(text=f"Winrate: {winrate:.1f}%")
-                lp_value.config(text=str(lp))
+                ui.configure(rank_name, text=f"{tier} {rank}")
+                ui.configure(winrate_label, text=f"Winrate: {winrate:.1f}%")
+                ui.configure(lp_value, text=str(lp))
             else:
                 # !!!!!!
-                rank_icon_label.configure(image='')
-                rank_name.config(text="Unranked")
-                winrate_label.config(text="Winrate: 0%")
-                lp_value.config(text="0")
+                ui.configure(rank_icon_label, image='')
+                ui.configure(rank_name, text="Unranked")
+                ui.configure(winrate_label, text="Winrate: 0%")
+                ui.configure(lp_value, text="0")
     
     except Exception as e:
         print(f"Błąd podczas aktualizacji interfejsu: {e}")
@@ -598,36 +421,71 @@ def show_loading_window():
     
     return loading_window, status_label
 
+def finish_search_profile(profile):
+    global last_profile_report
+    if profile:
+        last_profile_report = profile.finish()
+
+def update_ui_profiled(player_data, profile):
+    with profile_section(profile, "update_ui"):
+        update_ui(player_data)
+        # Wszystkie zmiany etykiet i obrazków z tego wyszukiwania idą jedną paczką
+        ui.flush()
+    finish_search_profile(profile)
+
+    summoner_data = player_data.get('summoner_data') or {}
+    prefetcher.schedule(player_data.get('matches_data', []), summoner_data.get('puuid'), list(recent_searches))
+    prefetcher.resume()
+
+def toggle_profiling():
+    profiling.set_profiling(profiling_var.get())
+
+def show_profile_report():
+    report_window = ttk.Toplevel()
+    report_window.title("Raport profilowania")
+    report_window.geometry("900x600")
+
+    report_text = ttk.Text(report_window, wrap="none", font=("Courier", 9))
+    report_text.pack(fill=BOTH, expand=True, padx=10, pady=10)
+    report_text.insert("1.0", last_profile_report or "Brak raportu - włącz profiler i wyszukaj gracza.\n\n" + profiling.timer_summary())
+    report_text.configure(state="disabled")
+
 def search_player():
     riot_id = search_entry.get()
     if not riot_id:
         show_error_message("Wprowadź nazwę gracza w formacie: nazwa#tag")
         return
  
+    # Profil obejmuje całe wyszukiwanie - od kliknięcia do końca update_ui
+    profile = start_search_profile(riot_id)
+    prefetcher.pause()
+    if riot_id in recent_searches:
+        recent_searches.remove(riot_id)
+    recent_searches.appendleft(riot_id)
     loading_window, status_label = show_loading_window()
     
-    def update_status(text):
-        status_label.config(text=text)
-    
+    # Wątek roboczy nie dotyka Tk - wszystko idzie przez kolejkę dispatchera
     def search_thread():
         try:
-            api_key = "RGAPI-a16b915f-274f-4254-8b34-eabd6e5e8fe6"  # API
-            riot_api = RiotAPI(api_key)
- 
-            root.after(0, lambda: update_status("Pobieranie danych gracza..."))
-            player_data = riot_api.get_player_data(riot_id)
+            ui.configure(status_label, text="Pobieranie danych gracza...")
+            with profile_section(profile, "get_player_data"):
+                player_data = riot_api.get_player_data(riot_id)
             
             if player_data:
-                root.after(0, lambda: update_status("Aktualizacja interfejsu..."))
-                root.after(0, lambda: update_ui(player_data))
-                root.after(0, loading_window.destroy)
+                ui.configure(status_label, text="Aktualizacja interfejsu...")
+                ui.call(update_ui_profiled, player_data, profile)
+                ui.call(loading_window.destroy)
             else:
-                root.after(0, loading_window.destroy)
-                root.after(0, lambda: show_error_message("Nie znaleziono gracza. Sprawdź nazwę i spróbuj ponownie."))
+                ui.call(loading_window.destroy)
+                ui.call(prefetcher.resume)
+                ui.call(finish_search_profile, profile)
+                ui.call(show_error_message, "Nie znaleziono gracza. Sprawdź nazwę i spróbuj ponownie.")
         
         except Exception as e:
-            root.after(0, loading_window.destroy)
-            root.after(0, lambda: show_error_message(f"Wystąpił błąd: {str(e)}"))
+            ui.call(loading_window.destroy)
+            ui.call(finish_search_profile, profile)
+            ui.call(prefetcher.resume)
+            ui.call(show_error_message, f"Wystąpił błąd: {str(e)}")
             print(f"Szczegóły błędu: {type(e).__name__}")
     
     # Tak jak Pan chciał użycie osobnych wątków aby nie lagowac apki
@@ -679,6 +537,13 @@ navbar.bind("<B1-Motion>", drag)
 home_btn = ttk.Button(navbar, text="Patch Notes", style="secondary.Outline.TButton", command=open_patch_notes)
 home_btn.pack(side=LEFT, padx=5, pady=5)
 
+profiling_var = ttk.BooleanVar(value=profiling.profiling_enabled)
+profiling_toggle = ttk.Checkbutton(navbar, text="Profiler", variable=profiling_var, style="secondary.Outline.Toolbutton", command=toggle_profiling)
+profiling_toggle.pack(side=LEFT, padx=5, pady=5)
+
+report_btn = ttk.Button(navbar, text="Raport", style="secondary.Outline.TButton", command=show_profile_report)
+report_btn.pack(side=LEFT, padx=5, pady=5)
+
 nav_title = ttk.Label(navbar, text="Lol Stats Finder", style="secondary.Inverse.TLabel", font=("Helvetica", 12, "bold"))
 nav_title.place(relx=0.5, rely=0.5, anchor="center")
 
@@ -722,6 +587,9 @@ search_entry.pack(side=LEFT, padx=5)
 search_button = ttk.Button(search_frame, text="Szukaj", style="primary.TButton", command=search_player)
 search_button.pack(side=LEFT, padx=5)
 
+track_button = ttk.Button(search_frame, text="Śledź", style="info.Outline.TButton", command=track_current_player)
+track_button.pack(side=LEFT, padx=5)
+
 bottom_section = ttk.Frame(root)
 bottom_section.pack(fill=BOTH, expand=True, padx=20, pady=10)
 
@@ -736,6 +604,11 @@ stats_panel.pack(fill=X, padx=5, pady=5)
 
 ttk.Label(stats_panel, text="Statystyki", font=("Helvetica", 14, "bold")).pack(pady=5)
 
+stats_queue_var = ttk.StringVar(value=ALL_QUEUES)
+stats_queue_select = ttk.Combobox(stats_panel, textvariable=stats_queue_var, values=[ALL_QUEUES], state="readonly", width=20)
+stats_queue_select.pack(pady=(0, 5))
+stats_queue_select.bind("<<ComboboxSelected>>", on_stats_queue_change)
+
 kda_frame = ttk.Frame(stats_panel)
 kda_frame.pack(fill=X, padx=10, pady=5)
 ttk.Label(kda_frame, text="KDA", font=("Helvetica", 12, "bold")).pack(side=LEFT)
@@ -771,6 +644,11 @@ top_champs_panel.pack(fill=X, padx=5, pady=5)
 
 ttk.Label(top_champs_panel, text="TOP 5 Championów", font=("Helvetica", 14, "bold")).pack(pady=5)
 
+champs_queue_var = ttk.StringVar(value=ALL_QUEUES)
+champs_queue_select = ttk.Combobox(top_champs_panel, textvariable=champs_queue_var, values=[ALL_QUEUES], state="readonly", width=20)
+champs_queue_select.pack(pady=(0, 5))
+champs_queue_select.bind("<<ComboboxSelected>>", on_champs_queue_change)
+
 top_champs_container = ttk.Frame(top_champs_panel)
 top_champs_container.pack(fill=X, padx=5, pady=5)
 
@@ -850,7 +728,42 @@ lp_label.pack(pady=5)
 lp_value = ttk.Label(lp_panel, text="0", font=("Helvetica", 24, "bold"))
 lp_value.pack(pady=5)
 
+live_panel = ttk.Frame(right_block, style="secondary.TFrame")
+live_panel.pack(fill=BOTH, expand=True, pady=(10, 0))
+
+ttk.Label(live_panel, text="Na żywo", font=("Helvetica", 14, "bold")).pack(pady=5)
+
+live_events_label = ttk.Label(live_panel, text="Brak zdarzeń", justify=LEFT)
+live_events_label.pack(padx=10, pady=5, anchor=W)
+
 lastClickX, lastClickY = 0, 0
+current_queue_stats = {}
+
+# Mecze i sumy statystyk zostają na dysku między wyszukiwaniami
+match_store = MatchStore()
+aggregate_store = AggregateStore()
+# Jedna instancja API, żeby stan hostów (bezpiecznik, czasy odpowiedzi) przetrwał między wyszukiwaniami
+riot_api = RiotAPI(API_KEY, match_store, aggregate_store)
+
+# Zmiany UI z wątków i usług w tle trafiają do jednej kolejki opróżnianej co tick
+ui = UIDispatcher(root)
+ui.start()
+
+current_player = None
+last_profile_report = None
+resized_image_cache = {}
+recent_searches = deque(maxlen=10)
+live_events = deque(maxlen=5)
+live_inbox = deque()
+
+# Śledzeni gracze sprawdzani w tle, zdarzenia trafiają do panelu "Na żywo"
+live_watcher = LiveGameWatcher(riot_api, on_live_event)
+live_watcher.load_tracked()
+live_watcher.start()
+
+# Rozgrzewanie cache w czasie bezczynności, wyszukiwanie zawsze ma pierwszeństwo
+prefetcher = Prefetcher(riot_api, icon_loader=prefetch_icon)
+prefetcher.start()
 
 root.mainloop()
 
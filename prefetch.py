@@ -0,0 +1,114 @@
+import time
+import queue
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from riot_api import RiotAPI
+
+# Ilu najczęstszych współgraczy rozgrzewamy po wyszukiwaniu
+TOP_CO_PLAYERS = 5
+# Po jakim czasie to samo zadanie może zostać powtórzone
+TASK_TTL = 120
+
+
+def frequent_co_players(matches_data: List[Dict], puuid: str, limit: int = TOP_CO_PLAYERS) -> List[Dict]:
+    """Najczęstsi współgracze z historii meczy (bez samego gracza)"""
+    counts = Counter()
+    players = {}
+    for match in matches_data or []:
+        for participant in match.get('info', {}).get('participants', []):
+            other = participant.get('puuid')
+            if not other or other == puuid:
+                continue
+            counts[other] += 1
+            players.setdefault(other, participant)
+
+    # Pojedynczy wspólny mecz to zwykle losowy gracz, a nie znajomy
+    return [players[other] for other, count in counts.most_common(limit) if count > 1]
+
+
+class Prefetcher(threading.Thread):
+    """Rozgrzewa cache kont, list meczy i ikon w czasie, gdy aplikacja nic nie robi"""
+
+    def __init__(self, api: RiotAPI, budget_fraction: float = 0.2,
+                 icon_loader: Optional[Callable[[str, Any], None]] = None):
+        super().__init__(daemon=True, name="prefetcher")
+        self.api = api
+        # Osobny budżet (ułamek limitów) i rezerwa we wspólnym, żeby wyszukiwanie zawsze miało zapytania
+        self.budget = api.rate_limiter.scaled(budget_fraction)
+        self.reserve = 1 - budget_fraction
+        self.icon_loader = icon_loader
+        self.tasks: queue.Queue = queue.Queue()
+        self.done: Dict = {}
+        self.pruned = time.monotonic()
+        self.idle = threading.Event()
+        self.idle.set()
+
+    def pause(self):
+        """Wyszukiwanie ma pierwszeństwo - kolejne zadania czekają aż się skończy"""
+        self.idle.clear()
+
+    def resume(self):
+        self.idle.set()
+
+    def schedule(self, matches_data: List[Dict], puuid: str, recent_riot_ids: Iterable[str]):
+        """Dodaje zadania po wyszukiwaniu: ikony, najczęstsi współgracze i ostatnio szukani gracze"""
+        champions = set()
+        items = set()
+        for match in matches_data or []:
+            for participant in match.get('info', {}).get('participants', []):
+                champions.add(participant.get('championName'))
+                items.update(participant.get(f'item{i}', 0) for i in range(7))
+        # Jedna ikona na zadanie, żeby pause() działało od razu, a nie po zdekodowaniu wszystkich
+        for champion in champions - {None}:
+            self.tasks.put(('icon', ('champion', champion)))
+        for item in items - {0, None}:
+            self.tasks.put(('icon', ('item', item)))
+
+        for player in frequent_co_players(matches_data, puuid):
+            if player.get('riotIdGameName') and player.get('riotIdTagline'):
+                self.tasks.put(('account', (player['riotIdGameName'], player['riotIdTagline'])))
+            self.tasks.put(('match_ids', (player['puuid'],)))
+
+        for riot_id in recent_riot_ids:
+            if '#' in riot_id:
+                self.tasks.put(('account', tuple(riot_id.split('#', 1))))
+
+    def _run_task(self, kind: str, args: tuple):
+        if kind == 'icon':
+            if self.icon_loader:
+                self.icon_loader(*args)
+        elif kind == 'account':
+            account_data = self.api.get_account_by_riot_id(*args)
+            # Dla ostatnio szukanych graczy od razu też lista meczy
+            if account_data and account_data.get('puuid'):
+                self.tasks.put(('match_ids', (account_data['puuid'],)))
+        elif kind == 'match_ids':
+            self.api.get_recent_match_ids(*args)
+
+    def run(self):
+        with self.api.low_priority(self.reserve, self.budget):
+            while True:
+                kind, args = self.tasks.get()
+                # Każde zadanie to najwyżej jedno-dwa zapytania, więc wyszukiwanie czeka maksymalnie na nie
+                self.idle.wait()
+
+                key = (kind, args)
+                if time.monotonic() - self.done.get(key, -TASK_TTL) < TASK_TTL:
+                    continue
+                try:
+                    self._run_task(kind, args)
+                except Exception as e:
+                    print(f"Błąd podczas prefetchu {kind}: {e}")
+                # Ikony pilnuje cache obrazków, więc zapamiętujemy tylko zapytania do API
+                if kind != 'icon':
+                    self._mark_done(key)
+
+    def _mark_done(self, key):
+        now = time.monotonic()
+        self.done[key] = now
+        # Wpisy starsze niż TASK_TTL już niczego nie blokują, więc nie trzymamy ich w nieskończoność
+        if now - self.pruned >= TASK_TTL:
+            self.done = {k: t for k, t in self.done.items() if now - t < TASK_TTL}
+            self.pruned = now
@@ -0,0 +1,135 @@
+import io
+import os
+import time
+import random
+import pstats
+import cProfile
+import datetime
+import threading
+import functools
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+
+# Profilowanie jest opcjonalne - włącza się zmienną LOL_PROFILE=1 albo przełącznikiem w aplikacji
+profiling_enabled = os.environ.get("LOL_PROFILE") == "1"
+REPORT_DIR = "profiles"
+TOP_N = 25
+# Poza trybem profilowania liczniki czasu mierzą tylko część wywołań
+TIMER_SAMPLE_RATE = 0.1
+
+timer_stats: Dict[str, Dict] = {}
+timer_lock = threading.Lock()
+
+
+def set_profiling(enabled: bool):
+    global profiling_enabled
+    profiling_enabled = enabled
+
+
+def timed(name: str):
+    """Dekorator mierzący czas funkcji - zawsze w trybie profilowania, inaczej co któreś wywołanie"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiling_enabled and random.random() >= TIMER_SAMPLE_RATE:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with timer_lock:
+                    stats = timer_stats.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+                    stats['count'] += 1
+                    stats['total'] += elapsed
+                    stats['max'] = max(stats['max'], elapsed)
+        return wrapper
+    return decorator
+
+
+def timer_summary() -> str:
+    with timer_lock:
+        rows = sorted(timer_stats.items(), key=lambda item: item[1]['total'], reverse=True)
+        lines = [f"{'funkcja':<28}{'próbki':>8}{'śr. ms':>10}{'max ms':>10}"]
+        for name, stats in rows:
+            avg = stats['total'] / stats['count'] * 1000
+            lines.append(f"{name:<28}{stats['count']:>8}{avg:>10.2f}{stats['max'] * 1000:>10.2f}")
+    return "\n".join(lines)
+
+
+class SearchProfile:
+    """Profil jednego wyszukiwania: cProfile z wątku roboczego i głównego oraz różnica pamięci z tracemalloc"""
+
+    def __init__(self, riot_id: str, report_dir: str = REPORT_DIR, top_n: int = TOP_N):
+        self.riot_id = riot_id
+        self.report_dir = report_dir
+        self.top_n = top_n
+        self.profiles = []
+        self.sections: Dict[str, float] = {}
+        self.lock = threading.Lock()
+        # tracemalloc mógł już być włączony przez kogoś innego - wtedy go nie wyłączamy
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+        self.snapshot_before = tracemalloc.take_snapshot()
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def section(self, name: str):
+        """Profiluje fragment w bieżącym wątku (cProfile działa per wątek)"""
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self.lock:
+                self.profiles.append(profile)
+                self.sections[name] = self.sections.get(name, 0.0) + time.perf_counter() - start
+
+    def finish(self) -> str:
+        """Zapisuje raport do katalogu i zwraca jego podsumowanie"""
+        total = time.perf_counter() - self.started
+        snapshot_after = tracemalloc.take_snapshot()
+        if self.started_tracing:
+            tracemalloc.stop()
+
+        safe_name = "".join(c if c.isalnum() else "_" for c in self.riot_id)
+        path = os.path.join(self.report_dir, f"{datetime.datetime.now():%Y%m%d_%H%M%S}_{safe_name}")
+        os.makedirs(path, exist_ok=True)
+
+        lines = [f"Wyszukiwanie: {self.riot_id}", f"Czas całkowity: {total * 1000:.0f} ms", ""]
+        for name, elapsed in self.sections.items():
+            lines.append(f"{name:<20}{elapsed * 1000:>10.0f} ms")
+
+        if self.profiles:
+            stats = pstats.Stats(self.profiles[0])
+            for profile in self.profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(os.path.join(path, "search.prof"))
+
+            output = io.StringIO()
+            stats.stream = output
+            stats.sort_stats("cumulative").print_stats(self.top_n)
+            lines += ["", f"Top {self.top_n} funkcji (czas łączny):", output.getvalue().strip()]
+
+        lines += ["", f"Top {self.top_n} miejsc alokacji pamięci:"]
+        for diff in snapshot_after.compare_to(self.snapshot_before, 'lineno')[:self.top_n]:
+            lines.append(str(diff))
+
+        lines += ["", "Liczniki czasu:", timer_summary()]
+
+        summary = "\n".join(lines)
+        with open(os.path.join(path, "summary.txt"), 'w', encoding='utf-8') as f:
+            f.write(summary)
+        return summary
+
+
+def start_search_profile(riot_id: str) -> Optional[SearchProfile]:
+    return SearchProfile(riot_id) if profiling_enabled else None
+
+
+def profile_section(profile: Optional[SearchProfile], name: str):
+    return profile.section(name) if profile else nullcontext()
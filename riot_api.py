@@ -0,0 +1,689 @@
+import os
+import math
+import time
+import random
+import threading
+import requests
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from profiling import timed
+
+# Klucz można nadpisać zmienną środowiskową, żeby nie zmieniać kodu przy nowym kluczu
+API_KEY = os.environ.get("RIOT_API_KEY", "RGAPI-a16b915f-274f-4254-8b34-eabd6e5e8fe6")
+
+# Klucz filtra obejmującego wszystkie kolejki
+ALL_QUEUES = "Wszystkie"
+
+# Ile zapytań naraz może się ścigać z zapasowymi
+HEDGE_WORKERS = 8
+
+# Platforma -> region, pod którym są mecze i konta
+PLATFORM_ROUTING = {
+    "eun1": "europe",
+    "euw1": "europe",
+    "tr1": "europe",
+    "ru": "europe",
+    "na1": "americas",
+    "br1": "americas",
+    "la1": "americas",
+    "la2": "americas",
+    "kr": "asia",
+    "jp1": "asia",
+    "oc1": "sea",
+}
+
+def get_queue_type(queue_id):
+    queue_types = {
+        400: "Normal",
+        420: "Ranked Solo",
+        430: "Normal",
+        440: "Ranked Flex",
+        450: "ARAM",
+        700: "Clash",
+        830: "Co-op vs AI",
+        840: "Co-op vs AI",
+        850: "Co-op vs AI",
+        900: "URF",
+        1020: "One for All",
+        1300: "Nexus Blitz",
+        1400: "Ultimate Spellbook",
+        1700: "Arena",
+    }
+    return queue_types.get(queue_id, "Other")
+
+def extract_player_stats(match: Dict, puuid: str) -> Optional[Dict]:
+    """Wyciąga statystyki gracza z jednego meczu"""
+    player_data = next((p for p in match['info']['participants'] 
+                      if p['puuid'] == puuid), None)
+    if not player_data:
+        return None
+
+    return {
+        'match_id': match.get('metadata', {}).get('matchId', ''),
+        'queue': get_queue_type(match['info'].get('queueId', 0)),
+        'champion': player_data['championName'],
+        'kills': player_data['kills'],
+        'deaths': player_data['deaths'],
+        'assists': player_data['assists'],
+        'cs': player_data['totalMinionsKilled'] + player_data['neutralMinionsKilled'],
+        'damage': player_data['totalDamageDealtToChampions'],
+        'vision': player_data['visionScore'],
+        'duration': match['info']['gameDuration'] / 60,
+        'win': bool(player_data['win']),
+        'game_start': match['info'].get('gameStartTimestamp', match['info'].get('gameCreation', 0))
+    }
+
+def new_totals() -> Dict:
+    """Tworzy puste sumy statystyk"""
+    return {
+        'games': 0,
+        'wins': 0,
+        'kills': 0,
+        'deaths': 0,
+        'assists': 0,
+        'cs': 0,
+        'damage': 0,
+        'vision': 0,
+        'duration': 0,
+        'champions': {}
+    }
+
+def add_to_totals(totals: Dict, game: Dict, sign: int = 1):
+    """Dodaje jeden mecz do sum statystyk (sign=-1 odejmuje go z powrotem)"""
+    totals['games'] += sign
+    totals['wins'] += sign if game['win'] else 0
+    totals['kills'] += sign * game['kills']
+    totals['deaths'] += sign * game['deaths']
+    totals['assists'] += sign * game['assists']
+    totals['cs'] += sign * game['cs']
+    totals['damage'] += sign * game['damage']
+    totals['vision'] += sign * game['vision']
+    totals['duration'] += sign * game['duration']
+
+    if game['champion'] not in totals['champions']:
+        totals['champions'][game['champion']] = {
+            'games': 0,
+            'wins': 0,
+            'kills': 0,
+            'deaths': 0,
+            'assists': 0
+        }
+
+    stats = totals['champions'][game['champion']]
+    stats['games'] += sign
+    stats['wins'] += sign if game['win'] else 0
+    stats['kills'] += sign * game['kills']
+    stats['deaths'] += sign * game['deaths']
+    stats['assists'] += sign * game['assists']
+
+    if stats['games'] <= 0:
+        del totals['champions'][game['champion']]
+
+def summarize_totals(totals: Dict) -> Dict:
+    """Zamienia sumy na średnie statystyki"""
+    valid_games = totals['games']
+    if valid_games == 0:
+        return {
+            'kda': '0/0/0',
+            'cs_per_min': 0,
+            'damage_per_min': 0,
+            'vision_score': 0,
+            'total_games': 0,
+            'wins': 0
+        }
+
+    total_game_duration = totals['duration']
+    kda = f"{totals['kills']/valid_games:.1f}/{totals['deaths']/valid_games:.1f}/{totals['assists']/valid_games:.1f}"
+
+    return {
+        'kda': kda,
+        'cs_per_min': round(totals['cs'] / total_game_duration, 1) if total_game_duration else 0,
+        'damage_per_min': round(totals['damage'] / total_game_duration, 1) if total_game_duration else 0,
+        'vision_score': round(totals['vision'] / valid_games, 1),
+        'total_games': valid_games,
+        'wins': totals['wins'],
+        'winrate': round((totals['wins'] / valid_games * 100), 1)
+    }
+
+def summarize_champions(totals: Dict) -> List[Dict]:
+    """Zamienia sumy championów na listę top 5"""
+    champions_list = []
+    for champ, stats in totals['champions'].items():
+        winrate = (stats['wins'] / stats['games']) * 100 if stats['games'] > 0 else 0
+        avg_kda = ((stats['kills'] + stats['assists']) / stats['deaths']) if stats['deaths'] > 0 else (stats['kills'] + stats['assists'])
+
+        champions_list.append({
+            'name': champ,
+            'games': stats['games'],
+            'winrate': winrate,
+            'avg_kda': avg_kda,
+            'kills': stats['kills'],
+            'deaths': stats['deaths'],
+            'assists': stats['assists']
+        })
+
+    champions_list.sort(key=lambda x: (x['games'], x['winrate']), reverse=True)
+    return champions_list[:5]
+
+def summarize_queues(queue_totals: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Zamienia sumy każdej kolejki na gotowe statystyki dla UI"""
+    return {
+        queue: {
+            'avg_stats': summarize_totals(totals),
+            'top_champions': summarize_champions(totals)
+        }
+        for queue, totals in queue_totals.items()
+    }
+
+class RequestPolicy:
+    """Ustawienia timeoutów, ponowień, zapytań zapasowych i bezpiecznika"""
+
+    def __init__(self, timeout: float = 5.0, max_retries: int = 2, backoff_base: float = 0.5,
+                 backoff_max: float = 8.0, hedge_after: Optional[float] = 1.0, hedge_quantile: float = 0.95,
+                 failure_threshold: int = 3, reset_after: float = 30.0):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # None wyłącza zapasowe zapytania
+        self.hedge_after = hedge_after
+        self.hedge_quantile = hedge_quantile
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+
+    def backoff(self, attempt: int) -> float:
+        """Czas oczekiwania przed kolejną próbą (pełny jitter)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class HostHealth:
+    """Stan jednego hosta API - nieudane zapytania z rzędu, bezpiecznik i ostatnie czasy odpowiedzi"""
+
+    def __init__(self):
+        self.failures = 0
+        self.open_until = 0.0
+        # Po otwarciu bezpiecznika tylko jedno próbne zapytanie naraz
+        self.probing = False
+        self.latencies = deque(maxlen=100)
+
+
+class CircuitBreaker:
+    """Pomija hosty, które ciągle zwracają błędy albo nie odpowiadają"""
+
+    def __init__(self, policy: RequestPolicy):
+        self.policy = policy
+        self.hosts: Dict[str, HostHealth] = {}
+        self.lock = threading.Lock()
+
+    def _health(self, host: str) -> HostHealth:
+        if host not in self.hosts:
+            self.hosts[host] = HostHealth()
+        return self.hosts[host]
+
+    def allow(self, host: str) -> bool:
+        """Czy można wysłać zapytanie; każde przepuszczone musi skończyć się record_success/record_failure/release"""
+        with self.lock:
+            health = self._health(host)
+            if health.failures < self.policy.failure_threshold:
+                return True
+            # Po upływie reset_after przepuszczamy jedno próbne zapytanie, jego błąd od razu znowu otwiera bezpiecznik
+            if health.open_until > time.monotonic() or health.probing:
+                return False
+            health.probing = True
+            return True
+
+    def record_success(self, host: str, latency: float):
+        with self.lock:
+            health = self._health(host)
+            health.failures = 0
+            health.open_until = 0.0
+            health.probing = False
+            health.latencies.append(latency)
+
+    def record_failure(self, host: str):
+        """Jedno nieudane zapytanie (po wszystkich ponowieniach)"""
+        with self.lock:
+            health = self._health(host)
+            health.failures += 1
+            health.probing = False
+            if health.failures >= self.policy.failure_threshold:
+                health.open_until = time.monotonic() + self.policy.reset_after
+                print(f"Host {host} pominięty na {self.policy.reset_after:.0f}s po {health.failures} błędach")
+
+    def release(self, host: str):
+        """Zapytanie skończyło się bez oceny hosta (np. 429) - zwalnia miejsce na próbne zapytanie"""
+        with self.lock:
+            self._health(host).probing = False
+
+    def hedge_delay(self, host: str) -> Optional[float]:
+        """Po jakim czasie wysłać zapasowe zapytanie - wg kwantyla ostatnich czasów hosta"""
+        if self.policy.hedge_after is None:
+            return None
+        with self.lock:
+            latencies = sorted(self._health(host).latencies)
+        if len(latencies) < 10:
+            return self.policy.hedge_after
+        return latencies[min(len(latencies) - 1, int(len(latencies) * self.policy.hedge_quantile))]
+
+class RateLimiter:
+    """Wspólny budżet zapytań - osobne limity dla każdego hosta (limity Riot są per region)"""
+
+    def __init__(self, limits: Tuple[Tuple[int, float], ...] = ((20, 1.0), (100, 120.0))):
+        # Domyślnie limity klucza deweloperskiego: 20 zapytań/1s i 100 zapytań/2min
+        self.limits = limits
+        # Host -> czasy wysłanych zapytań osobno dla każdego limitu. Przesuwane okno, a nie kubełek
+        # tokenów: kubełek odnawia się w trakcie okna i przepuszcza więcej, niż Riot pozwala.
+        self.windows: Dict[str, List[deque]] = {}
+        self.condition = threading.Condition()
+
+    def _windows(self, host: str, now: float) -> List[deque]:
+        if host not in self.windows:
+            self.windows[host] = [deque() for _ in self.limits]
+        windows = self.windows[host]
+        for (_, period), window in zip(self.limits, windows):
+            while window and window[0] <= now - period:
+                window.popleft()
+        return windows
+
+    def acquire(self, host: str, reserve: float = 0.0, blocking: bool = True) -> bool:
+        """Zajmuje miejsce na zapytanie do hosta; reserve to część budżetu, której zapytania w tle nie mogą ruszyć"""
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                windows = self._windows(host, now)
+                wait = 0.0
+                for (count, period), window in zip(self.limits, windows):
+                    allowed = count - reserve * count
+                    if len(window) < allowed:
+                        continue
+                    # Czekamy, aż z okna wypadnie tyle zapytań, żeby zostało mniej niż allowed
+                    keep = max(0, math.ceil(allowed) - 1)
+                    wait = max(wait, window[len(window) - keep - 1] + period - now)
+                if wait <= 0.0:
+                    for window in windows:
+                        window.append(now)
+                    return True
+                if not blocking:
+                    return False
+                self.condition.wait(wait)
+
+    def scaled(self, fraction: float) -> 'RateLimiter':
+        """Osobny, mniejszy budżet - ułamek tych samych limitów"""
+        return RateLimiter(tuple((max(1, int(count * fraction)), period) for count, period in self.limits))
+
+class TTLCache:
+    """Prosty cache z czasem ważności wpisów"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.entries: Dict[Any, Tuple[float, Any]] = {}
+        self.lock = threading.Lock()
+
+    def get(self, key) -> Optional[Any]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self.entries[key]
+                return None
+            return entry[1]
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+
+# Jedna klasa w programie do obsługi API
+class RiotAPI:
+    def __init__(self, api_key: str, match_store=None, aggregate_store=None, policy: Optional[RequestPolicy] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self.api_key = api_key
+        self.headers = {
+            "X-Riot-Token": self.api_key
+        }
+        # Opcjonalne magazyny z stats_store - bez nich wszystko liczy się od zera jak wcześniej
+        self.match_store = match_store
+        self.aggregate_store = aggregate_store
+        self.policy = policy or RequestPolicy()
+        self.breaker = CircuitBreaker(self.policy)
+        self.hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="riot-hedge")
+        # Wolne wątki puli - gdy wszystkie są zajęte, zapytanie idzie w bieżącym wątku zamiast czekać w kolejce
+        self.hedge_slots = threading.BoundedSemaphore(HEDGE_WORKERS)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # Priorytet jest per wątek, żeby usługi w tle nie zjadały budżetu wyszukiwania
+        self.local = threading.local()
+        # Konta zmieniają się rzadko, listy meczy szybko się starzeją
+        self.account_cache = TTLCache(3600)
+        self.match_ids_cache = TTLCache(120)
+
+    @contextmanager
+    def low_priority(self, reserve: float = 0.5, limiter: Optional[RateLimiter] = None):
+        """Zapytania z tego wątku zostawiają wolną część budżetu dla wyszukiwania,
+        a z limiter dodatkowo mieszczą się we własnym, mniejszym budżecie"""
+        previous = (getattr(self.local, 'reserve', 0.0), getattr(self.local, 'limiter', None))
+        self.local.reserve = reserve
+        self.local.limiter = limiter
+        try:
+            yield
+        finally:
+            self.local.reserve, self.local.limiter = previous
+
+    def _acquire(self, host: str, blocking: bool = True) -> bool:
+        limiter = getattr(self.local, 'limiter', None)
+        if limiter and not limiter.acquire(host, blocking=blocking):
+            return False
+        return self.rate_limiter.acquire(host, getattr(self.local, 'reserve', 0.0), blocking=blocking)
+
+    # Zapytania idą też w wątkach puli, których cProfile wyszukiwania nie widzi, więc mierzymy je osobno
+    @timed("http_get")
+    def _http_get(self, url: str) -> requests.Response:
+        return requests.get(url, headers=self.headers, timeout=self.policy.timeout)
+
+    def _submit(self, url: str) -> Future:
+        """Zleca GET wątkowi puli - miejsce w hedge_slots musi być już zajęte"""
+        future = self.hedge_executor.submit(self._http_get, url)
+        future.add_done_callback(lambda _: self.hedge_slots.release())
+        return future
+
+    @staticmethod
+    def _discard(future: Future):
+        """Przegrane zapytanie: anulujemy je, a jeśli już trwa - zamykamy odpowiedź, gdy przyjdzie"""
+        if not future.cancel():
+            future.add_done_callback(lambda f: f.exception() is None and f.result().close())
+
+    def _send(self, url: str, host: str) -> requests.Response:
+        """Wysyła GET, a gdy odpowiedź się spóźnia - drugi taki sam i bierze pierwszą odpowiedź"""
+        delay = self.breaker.hedge_delay(host)
+        # Wyścig dwóch zapytań potrzebuje wolnego wątku - bez niego zwykłe zapytanie w bieżącym wątku
+        if delay is None or not self.hedge_slots.acquire(blocking=False):
+            return self._http_get(url)
+
+        first = self._submit(url)
+        try:
+            return first.result(timeout=delay)
+        except FuturesTimeout:
+            pass
+
+        # Zapasowe zapytanie tylko gdy jest wolny wątek i token - nie czekamy na żadne z nich
+        if not self.hedge_slots.acquire(blocking=False):
+            return first.result()
+        if not self._acquire(host, blocking=False):
+            self.hedge_slots.release()
+            return first.result()
+
+        # Wszystkie zapytania tutaj to GET, więc zdublowanie jest bezpieczne
+        futures = [first, self._submit(url)]
+        error = None
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                error = e
+                continue
+            for other in futures:
+                if other is not future:
+                    self._discard(other)
+            return response
+        raise error
+
+    def _get(self, url: str) -> Optional[requests.Response]:
+        """GET z timeoutem, bezpiecznikiem hosta i ponowieniami dla 5xx/429"""
+        host = urlparse(url).netloc
+        if not self.breaker.allow(host):
+            return None
+
+        response = None
+        for attempt in range(self.policy.max_retries + 1):
+            self._acquire(host)
+            start = time.monotonic()
+            try:
+                response = self._send(url, host)
+            except requests.RequestException as e:
+                print(f"Błąd połączenia z {host}: {e}")
+                response = None
+            else:
+                if response.status_code < 500 and response.status_code != 429:
+                    self.breaker.record_success(host, time.monotonic() - start)
+                    return response
+
+            if attempt < self.policy.max_retries:
+                wait = self.policy.backoff(attempt)
+                if response is not None and response.status_code == 429:
+                    wait = max(wait, float(response.headers.get('Retry-After', 1)))
+                time.sleep(wait)
+
+        # Do bezpiecznika liczy się całe zapytanie, a nie każda próba;
+        # 429 to nasz limit, a nie awaria hosta, więc go nie liczymy
+        if response is not None and response.status_code == 429:
+            self.breaker.release(host)
+        else:
+            self.breaker.record_failure(host)
+        return response
+
+    def _get_json(self, url: str) -> Optional[Any]:
+        """Zwraca JSON odpowiedzi albo None gdy zapytanie się nie udało"""
+        response = self._get(url)
+        if response is not None and response.status_code == 200:
+            return response.json()
+        return None
+
+    def get_account_by_riot_id(self, game_name: str, tag_line: str) -> Optional[Dict]:
+        """Pobiera dane konta na podstawie Riot ID"""
+        cache_key = f"{game_name}#{tag_line}".lower()
+        account_data = self.account_cache.get(cache_key)
+        if account_data:
+            return account_data
+
+        regions = ["europe", "americas", "asia", "sea"]
+        
+        for region in regions:
+            url = f"https://{region}.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
+            try:
+                account_data = self._get_json(url)
+                if account_data:
+                    self.account_cache.put(cache_key, account_data)
+                    return account_data
+            except Exception as e:
+                print(f"Błąd podczas pobierania danych konta: {e}")
+                continue
+        return None
+
+    def get_summoner_by_puuid(self, puuid: str) -> Optional[Dict]:
+        """Pobiera dane przywoływacza po PUUID"""
+        regions = ["eun1", "euw1", "na1", "kr", "br1", "jp1", "la1", "la2", "oc1", "tr1", "ru"]
+        
+        for region in regions:
+            url = f"https://{region}.api.riotgames.com/lol/summoner/v4/summoners/by-puuid/{puuid}"
+            try:
+                summoner_data = self._get_json(url)
+                if summoner_data:
+                    summoner_data['platform'] = region
+                    return summoner_data
+            except Exception as e:
+                print(f"Błąd podczas pobierania przywoływacza z {region}: {e}")
+                continue
+        return None
+
+    def get_summoner_by_id(self, summoner_id: str, platform: str) -> Optional[Dict]:
+        """Pobiera dane przywoływacza po jego ID na konkretnej platformie"""
+        url = f"https://{platform}.api.riotgames.com/lol/summoner/v4/summoners/{summoner_id}"
+        return self._get_json(url)
+
+    def get_league_entries(self, platform: str, queue: str, tier: str, division: str, page: int = 1) -> Optional[List[Dict]]:
+        """Pobiera jedną stronę graczy z danej dywizji (IRON-DIAMOND)"""
+        url = f"https://{platform}.api.riotgames.com/lol/league/v4/entries/{queue}/{tier}/{division}?page={page}"
+        return self._get_json(url)
+
+    def get_apex_league(self, platform: str, queue: str, tier: str) -> Optional[List[Dict]]:
+        """Pobiera wszystkich graczy z MASTER/GRANDMASTER/CHALLENGER"""
+        url = f"https://{platform}.api.riotgames.com/lol/league/v4/{tier.lower()}leagues/by-queue/{queue}"
+        league = self._get_json(url)
+        return league.get('entries', []) if league else None
+
+    def get_ranked_stats(self, summoner_id: str) -> Optional[List[Dict]]:
+        """Pobiera statystyki rankingowe"""
+        url = f"https://eun1.api.riotgames.com/lol/league/v4/entries/by-summoner/{summoner_id}"
+        return self._get_json(url)
+
+    def get_match_history(self, puuid: str, count: int = 20, queue: Optional[int] = None,
+                          region: str = "europe", start: int = 0) -> Optional[List[str]]:
+        """Pobiera historię meczy, opcjonalnie tylko z jednej kolejki; start pomija najnowsze mecze"""
+        url = f"https://{region}.api.riotgames.com/lol/match/v5/matches/by-puuid/{puuid}/ids?start={start}&count={count}"
+        if queue is not None:
+            url += f"&queue={queue}"
+        return self._get_json(url)
+
+    def get_recent_match_ids(self, puuid: str, queue: Optional[int] = None) -> Optional[List[str]]:
+        """Ostatnie 20 ID meczy z krótkim cache - wyszukiwanie i prefetch korzystają z tej samej listy"""
+        match_ids = self.match_ids_cache.get((puuid, queue))
+        if match_ids is None:
+            match_ids = self.get_match_history(puuid, 20, queue)
+            if match_ids:
+                self.match_ids_cache.put((puuid, queue), match_ids)
+        return match_ids
+
+    def get_match_details(self, match_id: str, region: str = "europe") -> Optional[Dict]:
+        """Pobiera szczegóły meczu"""
+        url = f"https://{region}.api.riotgames.com/lol/match/v5/matches/{match_id}"
+        return self._get_json(url)
+
+    def get_active_game(self, puuid: str, platform: str) -> Tuple[Optional[bool], Optional[Dict]]:
+        """Sprawdza, czy gracz jest teraz w grze - (True, gra), (False, None) albo (None, None) gdy nie wiadomo"""
+        url = f"https://{platform}.api.riotgames.com/lol/spectator/v5/active-games/by-summoner/{puuid}"
+        response = self._get(url)
+        if response is None:
+            return None, None
+        if response.status_code == 200:
+            return True, response.json()
+        if response.status_code == 404:
+            return False, None
+        return None, None
+
+    def get_champion_mastery(self, puuid: str) -> Optional[List[Dict]]:
+        """Pobiera top championów gracza"""
+        url = f"https://eun1.api.riotgames.com/lol/champion-mastery/v4/champion-masteries/by-puuid/{puuid}"
+        return self._get_json(url)
+
+    def get_player_data(self, riot_id: str, queue: Optional[int] = None) -> Dict:
+        """Pobiera wszystkie dane gracza"""
+        try:
+            if '#' in riot_id:
+                game_name, tag_line = riot_id.split('#')
+            else:
+                game_name = riot_id
+                tag_line = 'EUW'
+
+            # Pobierz dane konta
+            account_data = self.get_account_by_riot_id(game_name, tag_line)
+            if not account_data:
+                return None
+
+            puuid = account_data.get('puuid')
+            if not puuid:
+                return None
+
+            # Pobierz pozostałe dane
+            summoner_data = self.get_summoner_by_puuid(puuid)
+            matches_data = self.get_match_history_details(puuid, queue)
+            ranked_stats = self.get_ranked_stats(summoner_data.get('id')) if summoner_data else None
+            champion_mastery = self.get_champion_mastery(puuid)
+
+            # Przetwórz dane
+            if summoner_data:
+                summoner_data['gameName'] = account_data.get('gameName')
+                summoner_data['tagLine'] = account_data.get('tagLine')
+
+            processed_data = self.process_summoner_data(summoner_data, matches_data)
+
+            return {
+                "account_data": account_data,
+                "summoner_data": processed_data,
+                "ranked_stats": ranked_stats or [],
+                "matches_data": matches_data,
+                "champion_mastery": champion_mastery or []
+            }
+
+        except Exception as e:
+            print(f"Błąd podczas pobierania danych gracza: {e}")
+            return None
+
+    def get_match_history_details(self, puuid: str, queue: Optional[int] = None) -> List[Dict]:
+        """Pobiera szczegółowe dane meczy"""
+        matches_data = []
+        match_ids = self.get_recent_match_ids(puuid, queue)
+        
+        if match_ids:
+            for match_id in match_ids:
+                match_details = self.match_store.get(match_id) if self.match_store else None
+                if not match_details:
+                    match_details = self.get_match_details(match_id)
+                    if match_details and self.match_store:
+                        self.match_store.put(match_details)
+                if match_details:
+                    matches_data.append(match_details)
+        
+        return matches_data
+
+    def process_summoner_data(self, summoner_data: Dict, matches_data: List[Dict]) -> Dict:
+        """Przetwarza dane przywoływacza"""
+        if not summoner_data:
+            return None
+
+        puuid = summoner_data.get('puuid', '')
+        aggregates = None
+        if self.aggregate_store and self.match_store and puuid:
+            # Zapisane sumy gracza - historia jest doczytywana do pierwszego znanego meczu, tak jak
+            # w refresh_player, bo same pobrane mecze (np. z filtra kolejki) zostawiłyby dziury.
+            # Import tutaj, bo stats_store importuje ten moduł.
+            from stats_store import refresh_player
+            aggregates = refresh_player(self, puuid, self.match_store, self.aggregate_store)
+        if aggregates:
+            queue_stats = aggregates.snapshot(window=20)
+        else:
+            # Wszystkie kolejki liczone w jednym przejściu, filtr w UI to tylko odczyt ze słownika
+            queue_stats = self.calculate_queue_stats(matches_data, puuid)
+
+        return {
+            'name': summoner_data.get('gameName', summoner_data.get('name', 'Unknown')),
+            'level': summoner_data.get('summonerLevel', 0),
+            'icon_id': summoner_data.get('profileIconId', 1),
+            'avg_stats': queue_stats[ALL_QUEUES]['avg_stats'],
+            'top_champions': queue_stats[ALL_QUEUES]['top_champions'],
+            'queue_stats': queue_stats,
+            'puuid': summoner_data.get('puuid', ''),
+            'platform': summoner_data.get('platform')
+        }
+
+    def calculate_queue_stats(self, matches_data: List[Dict], puuid: str) -> Dict[str, Dict]:
+        """Oblicza statystyki dla wszystkich meczy i osobno dla każdej kolejki"""
+        queue_totals = {ALL_QUEUES: new_totals()}
+
+        for match in matches_data or []:
+            try:
+                game = extract_player_stats(match, puuid)
+                if not game:
+                    continue
+
+                if game['queue'] not in queue_totals:
+                    queue_totals[game['queue']] = new_totals()
+
+                add_to_totals(queue_totals[ALL_QUEUES], game)
+                add_to_totals(queue_totals[game['queue']], game)
+
+            except Exception as e:
+                print(f"Błąd podczas przetwarzania meczu: {e}")
+                continue
+
+        return summarize_queues(queue_totals)
+
+    def calculate_average_stats(self, matches_data: List[Dict], puuid: str) -> Dict:
+        """Oblicza średnie statystyki z meczy"""
+        return self.calculate_queue_stats(matches_data, puuid)[ALL_QUEUES]['avg_stats']
+
+    def calculate_champion_stats(self, matches_data: List[Dict], puuid: str) -> List[Dict]:
+        """Oblicza statystyki championów"""
+        return self.calculate_queue_stats(matches_data, puuid)[ALL_QUEUES]['top_champions']
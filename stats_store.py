@@ -0,0 +1,266 @@
+import os
+import sys
+import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+from riot_api import API_KEY, ALL_QUEUES, RiotAPI, add_to_totals, extract_player_stats, new_totals, summarize_queues
+
+# Okna ostatnich gier trzymane dla każdego gracza
+WINDOW_SIZES = (20, 100)
+# Ile ostatnich ID meczy pamiętamy, żeby nie liczyć dwa razy tego samego meczu
+KNOWN_IDS_LIMIT = 1000
+
+
+def _write_json(path: str, data):
+    """Zapisuje JSON atomowo, żeby przerwany zapis nie zostawił uszkodzonego pliku"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Błąd podczas odczytu pliku {path}: {e}")
+        return None
+
+
+class MatchStore:
+    """Lokalny magazyn szczegółów meczy, jeden plik JSON na mecz"""
+
+    def __init__(self, directory: str = os.path.join('cache', 'matches')):
+        self.directory = directory
+
+    def _path(self, match_id: str) -> str:
+        # Podział na katalogi platform, żeby jeden katalog nie miał setek tysięcy plików
+        platform = match_id.split('_')[0]
+        return os.path.join(self.directory, platform, f"{match_id}.json")
+
+    def has(self, match_id: str) -> bool:
+        return os.path.exists(self._path(match_id))
+
+    def get(self, match_id: str) -> Optional[Dict]:
+        return _read_json(self._path(match_id))
+
+    def put(self, match: Dict):
+        match_id = match.get('metadata', {}).get('matchId')
+        if match_id:
+            _write_json(self._path(match_id), match)
+
+    def iter_ids(self) -> Iterator[str]:
+        """Zwraca ID wszystkich zapisanych meczy"""
+        if not os.path.isdir(self.directory):
+            return
+        for platform in sorted(os.listdir(self.directory)):
+            platform_dir = os.path.join(self.directory, platform)
+            if not os.path.isdir(platform_dir):
+                continue
+            for filename in sorted(os.listdir(platform_dir)):
+                if filename.endswith('.json'):
+                    yield filename[:-len('.json')]
+
+
+class PlayerAggregates:
+    """Sumy statystyk gracza aktualizowane tylko o nowe mecze"""
+
+    def __init__(self, puuid: str, state: Optional[Dict] = None):
+        state = state or {}
+        self.puuid = puuid
+        self.match_ids = deque(state.get('match_ids', [])[-KNOWN_IDS_LIMIT:])
+        self.known_ids = set(self.match_ids)
+        self.queues = state.get('queues') or {ALL_QUEUES: new_totals()}
+        # Ile razy nowych meczy było więcej, niż dało się pobrać - sumy z całej historii mają wtedy dziurę
+        self.gaps = state.get('gaps', 0)
+
+        # Okno to lista ostatnich gier i sumy liczone tylko z nich
+        saved_windows = state.get('windows', {})
+        self.windows = {}
+        for size in WINDOW_SIZES:
+            saved = saved_windows.get(str(size), {})
+            self.windows[size] = {
+                'games': deque(saved.get('games', [])),
+                'queues': saved.get('queues') or {ALL_QUEUES: new_totals()}
+            }
+
+    def has_match(self, match_id: str) -> bool:
+        return match_id in self.known_ids
+
+    def _remember(self, match_id: str):
+        self.match_ids.append(match_id)
+        self.known_ids.add(match_id)
+        if len(self.match_ids) > KNOWN_IDS_LIMIT:
+            self.known_ids.discard(self.match_ids.popleft())
+
+    def _apply(self, queue_totals: Dict, game: Dict, sign: int = 1):
+        for queue in (ALL_QUEUES, game['queue']):
+            if queue not in queue_totals:
+                queue_totals[queue] = new_totals()
+            add_to_totals(queue_totals[queue], game, sign)
+            if queue != ALL_QUEUES and queue_totals[queue]['games'] <= 0:
+                del queue_totals[queue]
+
+    def add_match(self, match: Dict) -> bool:
+        """Dodaje mecz do sum, zwraca False jeśli był już policzony"""
+        match_id = match.get('metadata', {}).get('matchId', '')
+        if not match_id or self.has_match(match_id):
+            return False
+
+        self._remember(match_id)
+        try:
+            game = extract_player_stats(match, self.puuid)
+        except Exception as e:
+            print(f"Błąd podczas przetwarzania meczu {match_id}: {e}")
+            return False
+        if not game:
+            return False
+
+        self._apply(self.queues, game)
+
+        # Okno jest posortowane po czasie rozpoczęcia gry, bo stary mecz może przyjść później
+        # (np. z pobrania jednej kolejki) - wtedy nie może wypchnąć nowszych gier
+        for size, window in self.windows.items():
+            games = window['games']
+            if len(games) >= size and game['game_start'] <= games[0].get('game_start', 0):
+                continue
+            position = len(games)
+            while position and games[position - 1].get('game_start', 0) > game['game_start']:
+                position -= 1
+            games.insert(position, game)
+            self._apply(window['queues'], game)
+            # Stała długość okna - najstarsza gra jest odejmowana, zamiast liczyć wszystko od nowa
+            if len(games) > size:
+                self._apply(window['queues'], games.popleft(), -1)
+
+        return True
+
+    def snapshot(self, window: Optional[int] = None) -> Dict[str, Dict]:
+        """Statystyki per kolejka z całej historii albo z okna ostatnich gier"""
+        queue_totals = self.windows[window]['queues'] if window else self.queues
+        return summarize_queues(queue_totals)
+
+    def to_dict(self) -> Dict:
+        return {
+            'puuid': self.puuid,
+            'match_ids': list(self.match_ids),
+            'queues': self.queues,
+            'gaps': self.gaps,
+            'windows': {
+                str(size): {
+                    'games': list(window['games']),
+                    'queues': window['queues']
+                }
+                for size, window in self.windows.items()
+            }
+        }
+
+
+class AggregateStore:
+    """Zapisuje sumy statystyk graczy na dysku, jeden plik na PUUID"""
+
+    def __init__(self, directory: str = os.path.join('cache', 'aggregates')):
+        self.directory = directory
+
+    def _path(self, puuid: str) -> str:
+        return os.path.join(self.directory, f"{puuid}.json")
+
+    def load(self, puuid: str) -> PlayerAggregates:
+        return PlayerAggregates(puuid, _read_json(self._path(puuid)))
+
+    def save(self, aggregates: PlayerAggregates):
+        _write_json(self._path(aggregates.puuid), aggregates.to_dict())
+
+
+def refresh_player(api: RiotAPI, puuid: str, match_store: MatchStore,
+                   aggregate_store: AggregateStore, count: int = 20,
+                   max_pages: int = 10) -> Optional[PlayerAggregates]:
+    """Dolicza do sum gracza tylko mecze, których jeszcze nie widzieliśmy; None gdy pobieranie się nie udało"""
+    aggregates = aggregate_store.load(puuid)
+
+    # Riot zwraca mecze od najnowszego, więc pierwszy znany mecz oznacza koniec nowych;
+    # do tego czasu pobieramy kolejne strony. Nowy gracz dostaje tylko jedną stronę historii.
+    new_ids = []
+    found_known = history_end = False
+    pages = max_pages if aggregates.match_ids else 1
+    for page in range(pages):
+        match_ids = api.get_match_history(puuid, count, start=page * count)
+        if match_ids is None:
+            # Błąd to nie "brak nowych meczy" - nic nie zapisujemy
+            return None
+        for match_id in match_ids:
+            if aggregates.has_match(match_id):
+                found_known = True
+                break
+            new_ids.append(match_id)
+        if found_known:
+            break
+        if len(match_ids) < count:
+            history_end = True
+            break
+
+    changed = False
+    if aggregates.match_ids and not found_known and not history_end:
+        aggregates.gaps += 1
+        changed = True
+        print(f"Gracz {puuid}: ponad {len(new_ids)} nowych meczy, starsze z nich pominięte")
+
+    # Od najstarszego; po nieudanym pobraniu przerywamy, żeby nowszy mecz nie stał się znanym
+    # i następne odświeżenie doszło z powrotem do tego, którego brakuje
+    failed = False
+    for match_id in reversed(new_ids):
+        match = match_store.get(match_id)
+        if not match:
+            match = api.get_match_details(match_id)
+            if not match:
+                failed = True
+                break
+            match_store.put(match)
+        changed = aggregates.add_match(match) or changed
+
+    if changed:
+        aggregate_store.save(aggregates)
+    return None if failed else aggregates
+
+
+def refresh_players(api: RiotAPI, puuids: List[str], match_store: MatchStore,
+                    aggregate_store: AggregateStore, workers: int = 4) -> Dict[str, PlayerAggregates]:
+    """Odświeża sumy wielu graczy równolegle"""
+    results = {}
+
+    def refresh(puuid):
+        try:
+            aggregates = refresh_player(api, puuid, match_store, aggregate_store)
+            if aggregates is None:
+                print(f"Nie udało się odświeżyć gracza {puuid}")
+            else:
+                results[puuid] = aggregates
+        except Exception as e:
+            print(f"Błąd podczas odświeżania gracza {puuid}: {e}")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(refresh, puuids))
+    return results
+
+
+if __name__ == "__main__":
+    # Użycie: python stats_store.py plik_z_puuid.txt (jeden PUUID na linię)
+    if len(sys.argv) != 2:
+        print("Użycie: python stats_store.py plik_z_puuid.txt")
+        sys.exit(1)
+
+    with open(sys.argv[1], encoding='utf-8') as f:
+        tracked = [line.strip() for line in f if line.strip()]
+
+    match_store = MatchStore()
+    aggregate_store = AggregateStore()
+    api = RiotAPI(API_KEY, match_store, aggregate_store)
+    refreshed = refresh_players(api, tracked, match_store, aggregate_store)
+    print(f"Odświeżono {len(refreshed)}/{len(tracked)} graczy")
@@ -0,0 +1,72 @@
+import threading
+import itertools
+from collections import OrderedDict
+
+
+class UIDispatcher:
+    """Jedna kolejka zmian UI z wątków roboczych do pętli Tk, opróżniana co stały czas"""
+
+    def __init__(self, root, tick_ms: int = 30):
+        self.root = root
+        self.tick_ms = tick_ms
+        self.lock = threading.Lock()
+        # Klucz -> (widget albo funkcja, opcje albo argumenty) w kolejności ostatniej zmiany
+        self.pending = OrderedDict()
+        self.counter = itertools.count()
+
+    def configure(self, widget, **options):
+        """Zmienia opcje widgetu; kolejne zmiany tego samego widgetu przed tickiem łączą się w jedną"""
+        with self.lock:
+            key = ('configure', widget)
+            if key in self.pending:
+                self.pending[key][1].update(options)
+                # Połączona zmiana idzie na koniec, żeby nie wyprzedziła wywołań dodanych po pierwszej
+                self.pending.move_to_end(key)
+            else:
+                self.pending[key] = (widget, dict(options))
+
+    def call(self, func, *args, key=None):
+        """Wywołuje funkcję w wątku Tk; z key zostaje tylko ostatnie wywołanie o tym kluczu"""
+        with self.lock:
+            if key is None:
+                key = next(self.counter)
+            else:
+                self.pending.pop(('call', key), None)
+            self.pending[('call', key)] = (func, args)
+
+    def start(self):
+        self.root.after(self.tick_ms, self._tick)
+
+    def _take(self) -> OrderedDict:
+        with self.lock:
+            batch = self.pending
+            self.pending = OrderedDict()
+        return batch
+
+    def _apply(self, batch: OrderedDict):
+        for (kind, _), (target, payload) in batch.items():
+            try:
+                if kind == 'configure':
+                    # Widget mógł zniknąć w międzyczasie (np. zamknięte okno ładowania)
+                    if not target.winfo_exists():
+                        continue
+                    target.configure(**payload)
+                    if 'image' in payload:
+                        # Tk nie trzyma referencji do PhotoImage, więc trzymamy ją na widgecie
+                        target.image = payload['image'] or None
+                else:
+                    target(*payload)
+            except Exception as e:
+                print(f"Błąd podczas aktualizacji interfejsu: {e}")
+
+    def flush(self):
+        """Wykonuje wszystko z kolejki; zmiany dodane w trakcie (np. przez update_ui) idą w tej samej paczce"""
+        for _ in range(10):
+            batch = self._take()
+            if not batch:
+                return
+            self._apply(batch)
+
+    def _tick(self):
+        self.flush()
+        self.root.after(self.tick_ms, self._tick)